@@ -1,72 +1,117 @@
 # actions/action_handler.py
 from kubernetes import client
+from k8s_connector.cluster_connector import get_api_client
+from k8s_connector.cluster_cache import ClusterStateCache
 from kubernetes.client.exceptions import ApiException
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Callable, Iterable
 
-def get_all_pods(namespace: str = None) -> List[Dict[str, Any]]:
-    """Get all pods with their status"""
+# Cap on concurrent API calls for one bulk operation, to avoid flooding the API server
+BULK_MAX_WORKERS = 10
+
+def run_bulk(fn: Callable[[str], str], names: Iterable[str], max_workers: int = BULK_MAX_WORKERS) -> Dict[str, str]:
+    """Apply fn to each name on a bounded thread pool; the result dict keeps input order"""
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as executor:
+        futures = {name: executor.submit(fn, name) for name in names}
+    return {name: future.result() for name, future in futures.items()}
+
+def _pod_to_dict(pod) -> Dict[str, Any]:
+    """Flatten a V1Pod into the status dict used across the actions"""
+    pod_info = {
+        'name': pod.metadata.name,
+        'namespace': pod.metadata.namespace,
+        'phase': pod.status.phase,
+        'ready': False,
+        'restarts': 0,
+        'age': pod.metadata.creation_timestamp,
+        'node': pod.spec.node_name or 'Unknown'
+    }
+    
+    if pod.status.container_statuses:
+        pod_info['ready'] = all(cs.ready for cs in pod.status.container_statuses)
+        pod_info['restarts'] = sum(cs.restart_count for cs in pod.status.container_statuses)
+    
+    return pod_info
+
+def _deployment_to_dict(dep) -> Dict[str, Any]:
+    """Flatten a V1Deployment into the status dict used across the actions"""
+    return {
+        'name': dep.metadata.name,
+        'namespace': dep.metadata.namespace,
+        'replicas': dep.spec.replicas,
+        'ready_replicas': dep.status.ready_replicas or 0,
+        'available_replicas': dep.status.available_replicas or 0,
+        'updated_replicas': dep.status.updated_replicas or 0,
+        'age': dep.metadata.creation_timestamp
+    }
+
+def _iter_pages(list_fn, page_size: int, **kwargs) -> Iterator[Any]:
+    """Yield items from a paginated LIST call, following continue tokens"""
+    token = None
+    while True:
+        page = list_fn(limit=page_size, _continue=token, **kwargs)
+        yield from page.items
+        token = page.metadata._continue
+        if not token:
+            return
+
+def iter_all_pods(namespace: str = None, page_size: int = 500, cache: ClusterStateCache = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield pods with their status page by page as the LIST arrives
+    Pass cache to read one cluster's watch cache, listing through its client until it has synced
+    """
     try:
-        v1 = client.CoreV1Api()
-        if namespace:
-            pods = v1.list_namespaced_pod(namespace)
-        else:
-            pods = v1.list_pod_for_all_namespaces()
+        # Otherwise serve from the watch cache when a long-running command started one
+        cache = cache or ClusterStateCache.active()
+        pods = cache.pods(namespace) if cache else None
+        if pods is None:
+            v1 = client.CoreV1Api(cache.api_client if cache else get_api_client())
+            if namespace:
+                pods = _iter_pages(v1.list_namespaced_pod, page_size, namespace=namespace)
+            else:
+                pods = _iter_pages(v1.list_pod_for_all_namespaces, page_size)
         
-        result = []
-        for pod in pods.items:
-            pod_info = {
-                'name': pod.metadata.name,
-                'namespace': pod.metadata.namespace,
-                'phase': pod.status.phase,
-                'ready': False,
-                'restarts': 0,
-                'age': pod.metadata.creation_timestamp,
-                'node': pod.spec.node_name or 'Unknown'
-            }
-            
-            if pod.status.container_statuses:
-                pod_info['ready'] = all(cs.ready for cs in pod.status.container_statuses)
-                pod_info['restarts'] = sum(cs.restart_count for cs in pod.status.container_statuses)
-            
-            result.append(pod_info)
-        
-        return result
+        for pod in pods:
+            yield _pod_to_dict(pod)
     except ApiException as e:
-        return [{'error': f"Failed to get pods: {e.reason}"}]
+        yield {'error': f"Failed to get pods: {e.reason}"}
     except Exception as e:
-        return [{'error': f"Error getting pods: {str(e)}"}]
+        yield {'error': f"Error getting pods: {str(e)}"}
 
-def get_all_deployments(namespace: str = None) -> List[Dict[str, Any]]:
-    """Get all deployments with their status"""
+def iter_all_deployments(namespace: str = None, page_size: int = 500, cache: ClusterStateCache = None) -> Iterator[Dict[str, Any]]:
+    """Yield deployments with their status page by page as the LIST arrives; cache as for iter_all_pods"""
     try:
-        apps_v1 = client.AppsV1Api()
-        if namespace:
-            deployments = apps_v1.list_namespaced_deployment(namespace)
-        else:
-            deployments = apps_v1.list_deployment_for_all_namespaces()
+        cache = cache or ClusterStateCache.active()
+        deployments = cache.deployments(namespace) if cache else None
+        if deployments is None:
+            apps_v1 = client.AppsV1Api(cache.api_client if cache else get_api_client())
+            if namespace:
+                deployments = _iter_pages(apps_v1.list_namespaced_deployment, page_size, namespace=namespace)
+            else:
+                deployments = _iter_pages(apps_v1.list_deployment_for_all_namespaces, page_size)
         
-        result = []
-        for dep in deployments.items:
-            result.append({
-                'name': dep.metadata.name,
-                'namespace': dep.metadata.namespace,
-                'replicas': dep.spec.replicas,
-                'ready_replicas': dep.status.ready_replicas or 0,
-                'available_replicas': dep.status.available_replicas or 0,
-                'updated_replicas': dep.status.updated_replicas or 0,
-                'age': dep.metadata.creation_timestamp
-            })
-        
-        return result
+        for dep in deployments:
+            yield _deployment_to_dict(dep)
     except ApiException as e:
-        return [{'error': f"Failed to get deployments: {e.reason}"}]
+        yield {'error': f"Failed to get deployments: {e.reason}"}
     except Exception as e:
-        return [{'error': f"Error getting deployments: {str(e)}"}]
+        yield {'error': f"Error getting deployments: {str(e)}"}
+
+def get_all_pods(namespace: str = None, cache: ClusterStateCache = None) -> List[Dict[str, Any]]:
+    """Get all pods with their status"""
+    return list(iter_all_pods(namespace, cache=cache))
+
+def get_all_deployments(namespace: str = None, cache: ClusterStateCache = None) -> List[Dict[str, Any]]:
+    """Get all deployments with their status"""
+    return list(iter_all_deployments(namespace, cache=cache))
 
-def get_all_namespaces() -> List[str]:
-    """Get all available namespaces"""
+def get_all_namespaces(api_client: client.ApiClient = None) -> List[str]:
+    """Get all available namespaces, through api_client when given instead of the shared client"""
     try:
-        v1 = client.CoreV1Api()
+        v1 = client.CoreV1Api(api_client or get_api_client())
         namespaces = v1.list_namespace()
         return [ns.metadata.name for ns in namespaces.items]
     except ApiException as e:
@@ -74,9 +119,9 @@ def get_all_namespaces() -> List[str]:
     except Exception as e:
         return [f"Error: {str(e)}"]
 
-def get_problematic_pods() -> List[Dict[str, Any]]:
+def get_problematic_pods(cache: ClusterStateCache = None) -> List[Dict[str, Any]]:
     """Get pods that are not running or not ready"""
-    all_pods = get_all_pods()
+    all_pods = get_all_pods(cache=cache)
     problematic = []
     
     for pod in all_pods:
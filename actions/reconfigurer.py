@@ -1,11 +1,12 @@
 from kubernetes import client
+from k8s_connector.cluster_connector import get_api_client
 from typing import Dict, Any
 
 
 def update_pod_resources(namespace: str, deployment: str, cpu_request: str = None, memory_request: str = None, cpu_limit: str = None, memory_limit: str = None):
     """Update resource requests and limits for a deployment"""
     try:
-        apps_v1 = client.AppsV1Api()
+        apps_v1 = client.AppsV1Api(get_api_client())
         
         # Get current deployment
         deployment_obj = apps_v1.read_namespaced_deployment(name=deployment, namespace=namespace)
@@ -45,7 +46,7 @@ def update_pod_resources(namespace: str, deployment: str, cpu_request: str = Non
 def apply_hpa(namespace: str, deployment: str, min_replicas: int = 2, max_replicas: int = 10, cpu_target: int = 70):
     """Apply Horizontal Pod Autoscaler to a deployment"""
     try:
-        autoscaling_v2 = client.AutoscalingV2Api()
+        autoscaling_v2 = client.AutoscalingV2Api(get_api_client())
         
         hpa = client.V2HorizontalPodAutoscaler(
             metadata=client.V1ObjectMeta(name=f"{deployment}-hpa", namespace=namespace),
@@ -94,7 +95,7 @@ def patch_deployment_env(namespace: str, deployment: str, env_name: str, env_val
                 }
             }
         }
-        apps_v1 = client.AppsV1Api()
+        apps_v1 = client.AppsV1Api(get_api_client())
         apps_v1.patch_namespaced_deployment(name=deployment, namespace=namespace, body=patch)
         return f"✅ Patched {deployment} in {namespace} with {env_name}={env_value}"
         
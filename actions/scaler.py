@@ -1,12 +1,14 @@
 # actions/scaler.py
 from kubernetes import client
+from k8s_connector.cluster_connector import get_api_client
+from actions.action_handler import run_bulk
 from kubernetes.client.exceptions import ApiException
 from typing import List, Dict
 
 def scale_deployment(namespace: str, deployment: str, replicas: int):
     """Scale a deployment to specified number of replicas"""
     try:
-        apps_v1 = client.AppsV1Api()
+        apps_v1 = client.AppsV1Api(get_api_client())
         body = {"spec": {"replicas": replicas}}
         apps_v1.patch_namespaced_deployment_scale(deployment, namespace, body)
         return f"✅ Scaled {deployment} in {namespace} to {replicas} replicas"
@@ -18,7 +20,7 @@ def scale_deployment(namespace: str, deployment: str, replicas: int):
 def get_current_replicas(namespace: str, deployment: str):
     """Get current replica count for a deployment"""
     try:
-        apps_v1 = client.AppsV1Api()
+        apps_v1 = client.AppsV1Api(get_api_client())
         dep = apps_v1.read_namespaced_deployment(deployment, namespace)
         return dep.spec.replicas
     except ApiException as e:
@@ -29,7 +31,7 @@ def get_current_replicas(namespace: str, deployment: str):
 def list_deployments(namespace: str = None):
     """List all deployments in namespace (or all namespaces if None)"""
     try:
-        apps_v1 = client.AppsV1Api()
+        apps_v1 = client.AppsV1Api(get_api_client())
         if namespace:
             deployments = apps_v1.list_namespaced_deployment(namespace)
         else:
@@ -59,20 +61,10 @@ def bulk_scale_deployments(namespace: str, deployments_config: Dict[str, int]) -
         deployments_config: Dict with deployment names as keys and desired replicas as values
                            Example: {'app1': 3, 'app2': 5, 'app3': 0}
     """
-    results = {}
-    apps_v1 = client.AppsV1Api()
-    
-    for deployment_name, replicas in deployments_config.items():
-        try:
-            body = {"spec": {"replicas": replicas}}
-            apps_v1.patch_namespaced_deployment_scale(deployment_name, namespace, body)
-            results[deployment_name] = f"✅ Scaled {deployment_name} in {namespace} to {replicas} replicas"
-        except ApiException as e:
-            results[deployment_name] = f"❌ Failed to scale {deployment_name} in {namespace}: {e.reason}"
-        except Exception as e:
-            results[deployment_name] = f"❌ Error scaling {deployment_name} in {namespace}: {str(e)}"
-    
-    return results
+    return run_bulk(
+        lambda deployment_name: scale_deployment(namespace, deployment_name, deployments_config[deployment_name]),
+        deployments_config
+    )
 
 
 def scale_all_deployments_in_namespace(namespace: str, replicas: int, label_selector: str = None) -> Dict[str, str]:
@@ -84,7 +76,7 @@ def scale_all_deployments_in_namespace(namespace: str, replicas: int, label_sele
         label_selector: Optional label selector to filter deployments
     """
     try:
-        apps_v1 = client.AppsV1Api()
+        apps_v1 = client.AppsV1Api(get_api_client())
         deployments = apps_v1.list_namespaced_deployment(namespace=namespace, label_selector=label_selector)
         deployment_names = [dep.metadata.name for dep in deployments.items]
         
@@ -102,7 +94,7 @@ def scale_all_deployments_in_namespace(namespace: str, replicas: int, label_sele
 def scale_deployment_by_percentage(namespace: str, deployment: str, percentage: float):
     """Scale a deployment by a percentage (e.g., 1.5 for 50% increase, 0.5 for 50% decrease)"""
     try:
-        apps_v1 = client.AppsV1Api()
+        apps_v1 = client.AppsV1Api(get_api_client())
         dep = apps_v1.read_namespaced_deployment(deployment, namespace)
         current_replicas = dep.spec.replicas
         new_replicas = max(1, int(current_replicas * percentage))  # Ensure at least 1 replica
@@ -118,19 +110,13 @@ def scale_deployment_by_percentage(namespace: str, deployment: str, percentage:
 
 def bulk_scale_deployments_by_percentage(namespace: str, deployment_names: List[str], percentage: float) -> Dict[str, str]:
     """Scale multiple deployments by percentage in bulk"""
-    results = {}
-    
-    for deployment_name in deployment_names:
-        result = scale_deployment_by_percentage(namespace, deployment_name, percentage)
-        results[deployment_name] = result
-    
-    return results
+    return run_bulk(lambda deployment_name: scale_deployment_by_percentage(namespace, deployment_name, percentage), deployment_names)
 
 
 def auto_scale_based_on_cpu(namespace: str, deployment: str, target_cpu_percent: int = 70):
     """Create or update HPA (Horizontal Pod Autoscaler) for a deployment"""
     try:
-        autoscaling_v2 = client.AutoscalingV2Api()
+        autoscaling_v2 = client.AutoscalingV2Api(get_api_client())
         
         # Check if HPA already exists
         try:
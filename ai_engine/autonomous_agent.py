@@ -8,6 +8,7 @@ import re
 import json
 import yaml
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
@@ -234,7 +235,10 @@ ACTION_1:
     def _execute_action_plan(self, action_plan: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Execute the action plan with safety validation"""
         results = []
+        pending = []
         
+        # Validate in plan order; approved actions are reserved against the rate limits right away
+        # so later actions in the same plan still see them
         for action_item in action_plan:
             action_name = action_item['action']
             params = action_item.get('parameters', {})
@@ -247,13 +251,13 @@ ACTION_1:
                 'timestamp': datetime.now().isoformat(),
                 'dry_run': self.dry_run
             }
+            results.append(result)
             
             # Safety validation
             is_safe, safety_reason = self.safety_manager.validate_action(action_item)
             if not is_safe:
                 result['status'] = 'blocked'
                 result['message'] = f"Blocked by safety manager: {safety_reason}"
-                results.append(result)
                 continue
             
             if self.dry_run:
@@ -261,37 +265,68 @@ ACTION_1:
                 result['message'] = f"Would execute {action_name} with params: {params}"
                 result['safety_check'] = 'passed'
             else:
-                try:
-                    # Execute the actual action
-                    action_func = self.available_actions[action_name]
-                    
-                    # Call the function with parameters
-                    if params:
-                        action_result = action_func(**params)
-                    else:
-                        action_result = action_func()
-                    
-                    result['status'] = 'success'
-                    result['result'] = action_result
-                    result['message'] = f"Successfully executed {action_name}"
-                    result['safety_check'] = 'passed'
-                    
-                    # Log successful action
-                    self.safety_manager.log_action(action_item, result)
-                    
-                except Exception as e:
-                    result['status'] = 'failed'
-                    result['error'] = str(e)
-                    result['message'] = f"Failed to execute {action_name}: {e}"
-                    
-                    # Log failed action
-                    self.safety_manager.log_action(action_item, result)
+                pending.append((action_item, result, self.safety_manager.reserve_action(action_item)))
             
-            results.append(result)
             self.execution_log.append(result)
         
+        # Actions on the same target run in plan order (e.g. restart then scale); different targets run concurrently
+        if pending:
+            groups = self._group_by_target(pending)
+            with ThreadPoolExecutor(max_workers=min(8, len(groups))) as executor:
+                list(executor.map(self._run_action_group, groups))
+            
+            # Log in plan order from this thread; the safety log is not thread-safe
+            for action_item, result, reserved_at in pending:
+                self.safety_manager.log_action(action_item, result, reserved_at)
+        
         return results
     
+    @staticmethod
+    def _group_by_target(pending: List[tuple]) -> List[List[tuple]]:
+        """Split approved actions into per-(namespace, resource) groups, keeping plan order inside each group"""
+        def target(action_item):
+            params = action_item.get('parameters', {})
+            name = params.get('pod_name') or params.get('deployment_name') or params.get('deployment')
+            return params.get('namespace', ''), name if isinstance(name, str) else None
+        
+        # Bulk actions name no single resource, so they serialize everything in their namespace
+        namespace_wide = {ns for ns, name in map(target, (item[0] for item in pending)) if name is None}
+        groups: Dict[tuple, List[tuple]] = {}
+        for item in pending:
+            namespace, name = target(item[0])
+            key = (namespace, None) if namespace in namespace_wide else (namespace, name)
+            groups.setdefault(key, []).append(item)
+        return list(groups.values())
+    
+    def _run_action_group(self, group: List[tuple]):
+        """Run one target's actions sequentially in plan order"""
+        for action_item, result, _ in group:
+            self._run_action(action_item, result)
+    
+    def _run_action(self, action_item: Dict[str, Any], result: Dict[str, Any]):
+        """Execute one approved action and record the outcome on its result"""
+        action_name = action_item['action']
+        params = action_item.get('parameters', {})
+        try:
+            # Execute the actual action
+            action_func = self.available_actions[action_name]
+            
+            # Call the function with parameters
+            if params:
+                action_result = action_func(**params)
+            else:
+                action_result = action_func()
+            
+            result['status'] = 'success'
+            result['result'] = action_result
+            result['message'] = f"Successfully executed {action_name}"
+            result['safety_check'] = 'passed'
+            
+        except Exception as e:
+            result['status'] = 'failed'
+            result['error'] = str(e)
+            result['message'] = f"Failed to execute {action_name}: {e}"
+    
     def get_execution_history(self) -> List[Dict[str, Any]]:
         """Get history of all autonomous actions taken"""
         return self.execution_log
@@ -374,6 +409,10 @@ def run_continuous_monitoring(interval_minutes: int = 5, max_iterations: int = 1
     print(f"🤖 Starting autonomous monitoring (dry_run={dry_run})")
     print(f"📊 Checking every {interval_minutes} minutes for {max_iterations} cycles")
     
+    # Cycles start on a fixed monotonic schedule so analysis time does not push later checks back
+    interval_seconds = interval_minutes * 60
+    started = time.monotonic()
+    
     for i in range(max_iterations):
         print(f"\n🔍 Monitoring cycle {i+1}/{max_iterations}")
         
@@ -387,8 +426,9 @@ def run_continuous_monitoring(interval_minutes: int = 5, max_iterations: int = 1
             print("✅ No issues detected, cluster is healthy")
         
         if i < max_iterations - 1:
-            print(f"😴 Sleeping for {interval_minutes} minutes...")
-            time.sleep(interval_minutes * 60)
+            delay = max(0.0, started + (i + 1) * interval_seconds - time.monotonic())
+            print(f"😴 Sleeping for {delay / 60:.1f} minutes...")
+            time.sleep(delay)
     
     print(f"\n📋 Total autonomous actions taken: {len(agent.execution_log)}")
     return agent.get_execution_history()
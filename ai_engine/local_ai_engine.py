@@ -4,14 +4,33 @@ Local AI Engine - Self-contained autonomous AI without external APIs
 Replaces Gemini API with intelligent local analysis
 """
 
-import json
+import bisect
 import re
+import threading
+import time
+from itertools import islice
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
-from datetime import datetime
-import random
 
-from .k8s_ai_analyzer import KubernetesAIAnalyzer
 
+_SEVERITY_EMOJI = {'critical': '🔴', 'high': '🟠', 'medium': '🟡', 'low': '🟢'}
+
+# Health grade buckets, indexed by bisect_right(_GRADE_BOUNDS, health_score)
+_GRADE_BOUNDS = (60, 70, 80, 90)
+_GRADE_TABLE = (
+    ('🚨 CRITICAL', "Your cluster is in critical condition and requires urgent intervention."),
+    ('🔴 POOR', "Your cluster has significant issues requiring immediate attention."),
+    ('🟠 FAIR', "Your cluster has moderate issues that should be addressed soon."),
+    ('🟡 GOOD', "Your cluster is generally healthy with some minor optimization opportunities."),
+    ('🟢 EXCELLENT', "Your cluster is running optimally with minimal issues detected."),
+)
+
+# Rendered responses keyed by snapshot fingerprint, shared by all engine instances
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_SIZE = 32
+_RESPONSE_CACHE_TTL = 30.0
+# Streamlit runs sessions on separate threads; guards each lookup and each insert/evict
+_RESPONSE_CACHE_LOCK = threading.Lock()
 
 class LocalAIEngine:
     """
@@ -19,7 +38,11 @@ class LocalAIEngine:
     Uses advanced ML libraries and rule-based intelligence
     """
     
+    __slots__ = ('ai_analyzer', 'analysis_templates', '_cache', '_cache_ttl')
+    
     def __init__(self):
+        # Deferred so importing this module doesn't pull in the ML stack
+        from .k8s_ai_analyzer import KubernetesAIAnalyzer
         self.ai_analyzer = KubernetesAIAnalyzer()
         self.analysis_templates = {
             'health_assessment': self._health_assessment_template,
@@ -27,20 +50,46 @@ class LocalAIEngine:
             'action_planning': self._action_planning_template,
             'optimization_suggestions': self._optimization_template
         }
+        self._cache = _RESPONSE_CACHE
+        self._cache_ttl = _RESPONSE_CACHE_TTL
     
     def analyze_and_recommend(self, cluster_info: Dict, pod_info: List[Dict], user_prompt: str = None) -> str:
         """
         Main AI analysis method that provides intelligent recommendations
         without external API dependencies
         """
+        # Reuse the last response if the cluster snapshot hasn't changed
+        key = self._snapshot_fingerprint(cluster_info, pod_info, user_prompt)
+        now = time.monotonic()
+        with _RESPONSE_CACHE_LOCK:
+            cached = self._cache.get(key)
+            if cached and now - cached[0] < self._cache_ttl:
+                self._cache.move_to_end(key)
+                return cached[1]
+        
         # Run advanced AI analysis
         ai_analysis = self.ai_analyzer.analyze_cluster_health()
         
         # Generate intelligent response based on analysis
         response = self._generate_intelligent_response(cluster_info, pod_info, ai_analysis, user_prompt)
         
+        with _RESPONSE_CACHE_LOCK:
+            self._cache[key] = (now, response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > _RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        
         return response
     
+    @staticmethod
+    def _snapshot_fingerprint(cluster_info: Dict, pod_info: List[Dict], user_prompt: str = None) -> tuple:
+        """Build a hashable key describing the cluster/pod snapshot and prompt"""
+        pods = tuple(
+            (p.get('namespace'), p.get('name'), p.get('phase', p.get('status')), p.get('restarts', 0))
+            for p in (pod_info or [])
+        )
+        return (str(cluster_info), pods, user_prompt)
+    
     def _generate_intelligent_response(self, cluster_info: Dict, pod_info: List[Dict], 
                                      ai_analysis: Dict, user_prompt: str = None) -> str:
         """Generate intelligent response using local AI logic"""
@@ -51,6 +100,15 @@ class LocalAIEngine:
         recommendations = ai_analysis.get('recommendations', [])
         anomalies = ai_analysis.get('anomalies', [])
         
+        # Single pass over issues for the counters used by the user-specific templates
+        restart_issues = []
+        critical_count = 0
+        for issue in critical_issues:
+            if 'restart' in issue.get('type', '').lower():
+                restart_issues.append(issue)
+            if issue.get('severity') == 'critical':
+                critical_count += 1
+        
         # Start building response
         response_parts = []
         
@@ -70,7 +128,7 @@ class LocalAIEngine:
         
         # 5. User-specific response
         if user_prompt:
-            response_parts.append(self._user_specific_analysis(user_prompt, ai_analysis))
+            response_parts.append(self._user_specific_analysis(user_prompt, ai_analysis, restart_issues, critical_count))
         
         # 6. Optimization suggestions
         response_parts.append(self._optimization_template(ai_analysis))
@@ -82,21 +140,8 @@ class LocalAIEngine:
         grade = ai_analysis.get('health_score', {}).get('grade', 'N/A')
         status = ai_analysis.get('health_score', {}).get('status', 'Unknown')
         
-        if health_score >= 90:
-            assessment = f"🟢 EXCELLENT CLUSTER HEALTH ({health_score:.1f}% - Grade {grade})"
-            details = "Your cluster is running optimally with minimal issues detected."
-        elif health_score >= 80:
-            assessment = f"🟡 GOOD CLUSTER HEALTH ({health_score:.1f}% - Grade {grade})"
-            details = "Your cluster is generally healthy with some minor optimization opportunities."
-        elif health_score >= 70:
-            assessment = f"🟠 FAIR CLUSTER HEALTH ({health_score:.1f}% - Grade {grade})"
-            details = "Your cluster has moderate issues that should be addressed soon."
-        elif health_score >= 60:
-            assessment = f"🔴 POOR CLUSTER HEALTH ({health_score:.1f}% - Grade {grade})"
-            details = "Your cluster has significant issues requiring immediate attention."
-        else:
-            assessment = f"🚨 CRITICAL CLUSTER HEALTH ({health_score:.1f}% - Grade {grade})"
-            details = "Your cluster is in critical condition and requires urgent intervention."
+        label, details = _GRADE_TABLE[bisect.bisect_right(_GRADE_BOUNDS, health_score)]
+        assessment = f"{label} CLUSTER HEALTH ({health_score:.1f}% - Grade {grade})"
         
         component_health = ai_analysis.get('health_score', {})
         
@@ -115,9 +160,8 @@ class LocalAIEngine:
         
         diagnosis = ["## 🔍 CRITICAL ISSUE DIAGNOSIS"]
         
-        for i, issue in enumerate(critical_issues[:5], 1):
-            severity_emoji = {'critical': '🔴', 'high': '🟠', 'medium': '🟡', 'low': '🟢'}
-            emoji = severity_emoji.get(issue.get('severity', 'low'), '🔵')
+        for i, issue in enumerate(islice(critical_issues, 5), 1):
+            emoji = _SEVERITY_EMOJI.get(issue.get('severity', 'low'), '🔵')
             
             issue_type = issue.get('type', 'unknown_issue')
             message = issue.get('message', 'No details available')
@@ -143,7 +187,7 @@ class LocalAIEngine:
         
         analysis.append(f"\n🤖 Machine learning algorithms detected {len(anomalies)} anomalous pods:")
         
-        for i, anomaly in enumerate(anomalies[:3], 1):
+        for i, anomaly in enumerate(islice(anomalies, 3), 1):
             pod_info = anomaly.get('pod', {})
             pod_name = pod_info.get('name', 'unknown')
             namespace = pod_info.get('namespace', 'unknown')
@@ -182,7 +226,7 @@ class LocalAIEngine:
         if critical_issues:
             planning.append("\n**🎯 Immediate Actions Required:**")
             
-            for issue in critical_issues[:5]:
+            for issue in islice(critical_issues, 5):
                 action_count += 1
                 action = issue.get('recommended_action', 'manual_investigation')
                 namespace = issue.get('namespace', 'unknown')
@@ -198,12 +242,12 @@ ACTION_{action_count}:
         if recommendations and action_count < 5:
             planning.append("\n**💡 Optimization Actions:**")
             
-            for rec in recommendations[:3]:
+            for rec in islice(recommendations, 3):
                 if action_count >= 5:
                     break
                 
                 rec_actions = rec.get('actions', ['investigate'])
-                for action in rec_actions[:1]:  # Take first action
+                for action in islice(rec_actions, 1):  # Take first action
                     action_count += 1
                     planning.append(f"""
 ACTION_{action_count}:
@@ -221,7 +265,8 @@ ACTION_1:
         
         return "\n".join(planning)
     
-    def _user_specific_analysis(self, user_prompt: str, ai_analysis: Dict) -> str:
+    def _user_specific_analysis(self, user_prompt: str, ai_analysis: Dict,
+                                restart_issues: List[Dict], critical_count: int) -> str:
         """Generate user-specific analysis based on their prompt"""
         
         analysis = ["## 🎯 USER-SPECIFIC ANALYSIS"]
@@ -232,11 +277,11 @@ ACTION_1:
         if any(word in prompt_lower for word in ['scale', 'scaling', 'replicas']):
             analysis.append(self._scaling_specific_analysis(ai_analysis))
         elif any(word in prompt_lower for word in ['restart', 'reboot', 'crash']):
-            analysis.append(self._restart_specific_analysis(ai_analysis))
+            analysis.append(self._restart_specific_analysis(restart_issues))
         elif any(word in prompt_lower for word in ['performance', 'slow', 'latency']):
             analysis.append(self._performance_specific_analysis(ai_analysis))
         elif any(word in prompt_lower for word in ['error', 'fail', 'problem']):
-            analysis.append(self._error_specific_analysis(ai_analysis))
+            analysis.append(self._error_specific_analysis(critical_count))
         else:
             analysis.append(self._general_analysis(user_prompt, ai_analysis))
         
@@ -258,11 +303,8 @@ ACTION_1:
 **🎯 Recommendation**: Current scaling appears optimal
 **🛠️ Suggested Action**: apply_hpa for automatic scaling"""
     
-    def _restart_specific_analysis(self, ai_analysis: Dict) -> str:
+    def _restart_specific_analysis(self, restart_issues: List[Dict]) -> str:
         """Restart-focused analysis"""
-        issues = ai_analysis.get('critical_issues', [])
-        restart_issues = [i for i in issues if 'restart' in i.get('type', '').lower()]
-        
         if restart_issues:
             return f"""
 **🔍 Restart Analysis**: Found {len(restart_issues)} restart-related issues
@@ -290,11 +332,8 @@ ACTION_1:
 **🎯 Recommendation**: No immediate performance concerns
 **🛠️ Suggested Action**: update_pod_resources for optimization"""
     
-    def _error_specific_analysis(self, ai_analysis: Dict) -> str:
+    def _error_specific_analysis(self, critical_count: int) -> str:
         """Error-focused analysis"""
-        critical_issues = ai_analysis.get('critical_issues', [])
-        critical_count = len([i for i in critical_issues if i.get('severity') == 'critical'])
-        
         if critical_count > 0:
             return f"""
 **🔍 Error Analysis**: {critical_count} critical errors detected
@@ -326,7 +365,7 @@ ACTION_1:
         
         if recommendations:
             optimization.append("\n**💡 AI-Recommended Optimizations:**")
-            for i, rec in enumerate(recommendations[:3], 1):
+            for i, rec in enumerate(islice(recommendations, 3), 1):
                 priority = rec.get('priority', 'medium').upper()
                 message = rec.get('message', 'No details')
                 actions = rec.get('actions', ['investigate'])
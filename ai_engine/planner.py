@@ -4,51 +4,42 @@ Local AI-powered cluster planner
 Uses autonomous AI engine instead of external APIs
 """
 
-import yaml
-import time
-from ai_engine.prompt_templates import BASE_DIAGNOSIS_TEMPLATE
-from k8s_connector.kube_api import get_cluster_summary
-from .local_ai_engine import LocalAIEngine, run_local_ai_analysis
-#     else:
-#         prompt = BASE_DIAGNOSIS_TEMPLATE.format(cluster_state=cluster_info)
+from concurrent.futures import ThreadPoolExecutor
 
-#     payload = {
-#         "contents": [
-#             {"parts": [{"text": prompt}]}
-#         ]
-#     }
+from k8s_connector.kube_api import get_cluster_summary
 
-#     response = requests.post(
-#         f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}",
-#         json=payload
-#     )
+# Shared engine so repeated diagnoses reuse the same analyzer instead of rebuilding it
+_local_ai_engine = None
 
-#     result = response.json()
-#     return result["candidates"][0]["content"]["parts"][0]["text"]
 
-# ai_engine/planner.py
-
-import httpx
-import yaml
-import time
-from ai_engine.prompt_templates import BASE_DIAGNOSIS_TEMPLATE
-from k8s_connector.kube_api import get_cluster_summary
+def _get_local_ai_engine():
+    """Return the process-wide local AI engine, creating it on first use"""
+    global _local_ai_engine
+    if _local_ai_engine is None:
+        from .local_ai_engine import LocalAIEngine
+        _local_ai_engine = LocalAIEngine()
+    return _local_ai_engine
 
-from .local_ai_engine import LocalAIEngine, run_local_ai_analysis
 
-def diagnose_cluster(prompt_override: str = None):
-    cluster_info = get_cluster_summary()
-    
-    # Get problematic pods for detailed analysis
+def _problematic_pods_or_empty():
+    """Problematic pods for detailed analysis, or an empty list if they cannot be fetched"""
     try:
         from actions.action_handler import get_problematic_pods
-        pod_info = get_problematic_pods()
+        return get_problematic_pods()
     except:
-        pod_info = []
+        return []
+
+
+def diagnose_cluster(prompt_override: str = None):
+    # The summary and problem listings are independent API round trips; overlap them
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pod_future = executor.submit(_problematic_pods_or_empty)
+        cluster_info = get_cluster_summary()
+        pod_info = pod_future.result()
     
     try:
         # Use local AI engine instead of external API
-        local_ai = LocalAIEngine()
+        local_ai = _get_local_ai_engine()
         ai_response = local_ai.analyze_and_recommend(
             cluster_info=cluster_info,
             pod_info=pod_info,
@@ -5,43 +5,162 @@ Ensures AI actions are safe and controlled
 """
 
 from typing import Dict, List, Any, Tuple
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime
 import json
 import os
+import re
+import time
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# JSON Lines action log, and the JSON array log it replaced (imported once, then renamed)
+SAFETY_LOG_PATH = "/tmp/autokubex_safety_log.jsonl"
+LEGACY_SAFETY_LOG_PATH = "/tmp/autokubex_safety_log.json"
+
+# Action-name keywords that trigger extra safety checks
+_ACTION_TAG_RE = re.compile(r'delete|bulk|scale')
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize a log record to one newline-terminated line of compact JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, separators=(',', ':')).encode() + b'\n'
+
+
+def _loads(data: bytes) -> Any:
+    """Deserialize a log record from JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _record_epoch(action: Dict[str, Any]) -> float:
+    """Return a log record's epoch, parsing the ISO timestamp only for pre-epoch records"""
+    ts = action.get('ts')
+    if ts is None:
+        ts = datetime.fromisoformat(action['timestamp']).timestamp()
+    return ts
+
+
+def _iter_lines_reversed(f, block_size: int = 65536):
+    """Yield the lines of a binary file from last to first"""
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    remainder = b''
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        f.seek(position)
+        lines = (f.read(read_size) + remainder).split(b'\n')
+        remainder = lines.pop(0)
+        yield from reversed(lines)
+    yield remainder
+
 
 class SafetyManager:
     """Manages safety constraints for autonomous AI operations"""
     
     def __init__(self):
-        self.safety_log_path = "/tmp/autokubex_safety_log.json"
+        self.safety_log_path = SAFETY_LOG_PATH
         self.max_actions_per_hour = 20
         self.max_deletions_per_hour = 5
         self.protected_namespaces = ['kube-system', 'kube-public', 'istio-system']
         self.protected_resources = ['coredns', 'kube-proxy', 'etcd']
-        self.action_history = self._load_action_history()
+        self._protected_ns = frozenset(self.protected_namespaces)
+        self._protected_re = re.compile('|'.join(re.escape(p) for p in self.protected_resources), re.IGNORECASE)
+        self.action_history = deque(self._load_action_history(), maxlen=100)
+        self._appends_since_compact = 0
+        
+        # Sliding one-hour windows of action epochs, oldest on the left
+        self._action_times = deque()
+        self._deletion_times = deque()
+        for action in self.action_history:
+            self._track_action(action.get('action'), _record_epoch(action))
     
     def _load_action_history(self) -> List[Dict]:
-        """Load recent action history from file"""
-        if os.path.exists(self.safety_log_path):
+        """Load recent action history from the JSON Lines log"""
+        history = []
+        self._import_legacy_log()
+        try:
+            # Walk newest-first and stop at the 24 hour cutoff or the retention cap
+            cutoff = time.time() - 24 * 3600
+            with open(self.safety_log_path, 'rb', buffering=65536) as f:
+                for line in _iter_lines_reversed(f):
+                    if not line.strip():
+                        continue
+                    try:
+                        action = _loads(line)
+                    except ValueError:
+                        continue  # Torn trailing write
+                    if _record_epoch(action) <= cutoff:
+                        break
+                    history.append(action)
+                    if len(history) >= 100:
+                        break
+        except Exception:
+            pass
+        history.reverse()
+        return history
+    
+    def _import_legacy_log(self):
+        """Prepend records from the old JSON array log to the JSON Lines log, then retire the old file"""
+        try:
+            with open(LEGACY_SAFETY_LOG_PATH, 'rb') as f:
+                records = _loads(f.read())
+        except FileNotFoundError:
+            return
+        except Exception:
+            records = []  # Unreadable; retire it anyway rather than retrying on every start
+        if not isinstance(records, list):
+            records = []
+        
+        try:
             try:
-                with open(self.safety_log_path, 'r') as f:
-                    history = json.load(f)
-                # Filter to last 24 hours
-                cutoff = datetime.now() - timedelta(hours=24)
-                return [
-                    action for action in history 
-                    if datetime.fromisoformat(action['timestamp']) > cutoff
-                ]
-            except:
-                pass
-        return []
+                with open(self.safety_log_path, 'rb') as f:
+                    existing = f.read()
+            except FileNotFoundError:
+                existing = b''
+            
+            # Legacy records predate the JSON Lines log, so they go first to keep it oldest-first
+            os.makedirs(os.path.dirname(self.safety_log_path), exist_ok=True)
+            tmp_path = f"{self.safety_log_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.writelines(_dumps_line(record) for record in records if isinstance(record, dict) and 'timestamp' in record)
+                f.write(existing)
+            os.replace(tmp_path, self.safety_log_path)
+            os.replace(LEGACY_SAFETY_LOG_PATH, f"{LEGACY_SAFETY_LOG_PATH}.imported")
+        except Exception as e:
+            print(f"⚠️ Failed to import legacy safety log: {e}")
+    
+    def _append_action(self, log_entry: Dict[str, Any]):
+        """Append a single record to the log, compacting it periodically"""
+        try:
+            os.makedirs(os.path.dirname(self.safety_log_path), exist_ok=True)
+            with open(self.safety_log_path, 'ab') as f:
+                f.write(_dumps_line(log_entry))
+        except Exception as e:
+            print(f"⚠️ Failed to save safety log: {e}")
+            return
+        
+        self._appends_since_compact += 1
+        if self._appends_since_compact >= 100:
+            self._save_action_history()
     
     def _save_action_history(self):
-        """Save action history to file"""
+        """Rewrite the log with only the retained history"""
         try:
             os.makedirs(os.path.dirname(self.safety_log_path), exist_ok=True)
-            with open(self.safety_log_path, 'w') as f:
-                json.dump(self.action_history, f, indent=2)
+            tmp_path = f"{self.safety_log_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.writelines(map(_dumps_line, self.action_history))
+            os.replace(tmp_path, self.safety_log_path)
+            self._appends_since_compact = 0
         except Exception as e:
             print(f"⚠️ Failed to save safety log: {e}")
     
@@ -52,38 +171,42 @@ class SafetyManager:
         Returns:
             (is_safe, reason)
         """
+        # Rate limits run first so the common deny path skips all string work
+        now = time.time()
+        
+        # Check 1: Rate limiting
+        recent_actions = self._count_recent_actions(now)
+        if recent_actions >= self.max_actions_per_hour:
+            return False, f"❌ Rate limit exceeded: {recent_actions}/{self.max_actions_per_hour} actions per hour"
+        
         action_name = action.get('action', '')
         params = action.get('parameters', {})
         namespace = params.get('namespace', '')
+        tags = set(_ACTION_TAG_RE.findall(action_name.lower()))
+        
+        # Check 2: Deletion limits
+        if 'delete' in tags:
+            recent_deletions = self._count_recent_deletions(now)
+            if recent_deletions >= self.max_deletions_per_hour:
+                return False, f"❌ Deletion limit exceeded: {recent_deletions}/{self.max_deletions_per_hour} deletions per hour"
         
-        # Check 1: Protected namespaces
-        if namespace in self.protected_namespaces:
+        # Check 3: Protected namespaces
+        if namespace in self._protected_ns:
             return False, f"❌ Cannot modify protected namespace: {namespace}"
         
-        # Check 2: Protected resources
+        # Check 4: Protected resources
         resource_name = params.get('pod_name', params.get('deployment', ''))
-        if any(protected in resource_name.lower() for protected in self.protected_resources):
+        if self._protected_re.search(resource_name):
             return False, f"❌ Cannot modify protected resource: {resource_name}"
         
-        # Check 3: Rate limiting
-        recent_actions = self._count_recent_actions()
-        if recent_actions >= self.max_actions_per_hour:
-            return False, f"❌ Rate limit exceeded: {recent_actions}/{self.max_actions_per_hour} actions per hour"
-        
-        # Check 4: Deletion limits
-        if 'delete' in action_name.lower():
-            recent_deletions = self._count_recent_deletions()
-            if recent_deletions >= self.max_deletions_per_hour:
-                return False, f"❌ Deletion limit exceeded: {recent_deletions}/{self.max_deletions_per_hour} deletions per hour"
-        
         # Check 5: Bulk operation limits
-        if 'bulk' in action_name.lower():
+        if 'bulk' in tags:
             resource_list = params.get('pod_names', params.get('deployment_names', []))
             if len(resource_list) > 10:
                 return False, f"❌ Bulk operation too large: {len(resource_list)} resources (max 10)"
         
         # Check 6: Scaling limits
-        if 'scale' in action_name.lower():
+        if 'scale' in tags:
             replicas = params.get('replicas', 0)
             if replicas > 20:
                 return False, f"❌ Scale target too high: {replicas} replicas (max 20)"
@@ -94,45 +217,58 @@ class SafetyManager:
         
         return True, "✅ Action is safe to execute"
     
-    def _count_recent_actions(self) -> int:
+    def _track_action(self, action_name: str, epoch: float):
+        """Record an action in the sliding-window counters"""
+        self._action_times.append(epoch)
+        if 'delete' in (action_name or '').lower():
+            self._deletion_times.append(epoch)
+    
+    def _evict(self, now: float):
+        """Drop window entries older than one hour"""
+        cutoff = now - 3600
+        for window in (self._action_times, self._deletion_times):
+            while window and window[0] <= cutoff:
+                window.popleft()
+    
+    def _count_recent_actions(self, now: float = None) -> int:
         """Count actions in the last hour"""
-        cutoff = datetime.now() - timedelta(hours=1)
-        return len([
-            action for action in self.action_history
-            if datetime.fromisoformat(action['timestamp']) > cutoff
-        ])
+        self._evict(time.time() if now is None else now)
+        return len(self._action_times)
     
-    def _count_recent_deletions(self) -> int:
+    def _count_recent_deletions(self, now: float = None) -> int:
         """Count deletion actions in the last hour"""
-        cutoff = datetime.now() - timedelta(hours=1)
-        return len([
-            action for action in self.action_history
-            if datetime.fromisoformat(action['timestamp']) > cutoff
-            and 'delete' in action.get('action', '').lower()
-        ])
+        self._evict(time.time() if now is None else now)
+        return len(self._deletion_times)
     
-    def log_action(self, action: Dict[str, Any], result: Dict[str, Any]):
+    def reserve_action(self, action: Dict[str, Any]) -> float:
+        """Count an approved action against the rate limits before it runs; pass the result to log_action"""
+        now = time.time()
+        self._track_action(action.get('action'), now)
+        return now
+    
+    def log_action(self, action: Dict[str, Any], result: Dict[str, Any], reserved_at: float = None):
         """Log an executed action for safety tracking"""
+        now = time.time() if reserved_at is None else reserved_at
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
+            'ts': now,
             'action': action.get('action'),
             'parameters': action.get('parameters'),
             'status': result.get('status'),
             'reason': action.get('reason')
         }
         
+        # Bounded deque keeps only the last 100 entries
         self.action_history.append(log_entry)
+        if reserved_at is None:
+            self._track_action(log_entry['action'], now)
         
-        # Keep only last 100 entries
-        if len(self.action_history) > 100:
-            self.action_history = self.action_history[-100:]
-        
-        self._save_action_history()
+        self._append_action(log_entry)
     
     def get_safety_status(self) -> Dict[str, Any]:
         """Get current safety status and limits"""
-        recent_actions = self._count_recent_actions()
-        recent_deletions = self._count_recent_deletions()
+        now = time.time()
+        recent_actions = self._count_recent_actions(now)
+        recent_deletions = self._count_recent_deletions(now)
         
         return {
             'actions_last_hour': recent_actions,
@@ -141,7 +277,11 @@ class SafetyManager:
             'deletions_limit': self.max_deletions_per_hour,
             'protected_namespaces': self.protected_namespaces,
             'protected_resources': self.protected_resources,
-            'total_logged_actions': len(self.action_history)
+            'total_logged_actions': len(self.action_history),
+            'last_action_at': (
+                datetime.fromtimestamp(_record_epoch(self.action_history[-1])).isoformat()
+                if self.action_history else None
+            )
         }
 
 
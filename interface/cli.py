@@ -1,117 +1,230 @@
 import typer
 import json
-from typing import Optional
-from k8s_connector.cluster_connector import load_cluster
-from ai_engine.planner import diagnose_cluster
-from ai_engine.autonomous_agent import run_autonomous_diagnosis, run_continuous_monitoring, AutonomousAgent
-from actions.restarter import restart_pod, delete_pod, restart_deployment, bulk_restart_pods, bulk_delete_pods, bulk_restart_deployments, bulk_delete_deployments, restart_all_pods_in_namespace
-from actions.scaler import scale_deployment, get_current_replicas, list_deployments, bulk_scale_deployments, scale_all_deployments_in_namespace, scale_deployment_by_percentage, bulk_scale_deployments_by_percentage
-from actions.action_handler import get_all_pods, get_all_deployments, get_problematic_pods
-
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Cluster, action and AI modules pull in the kubernetes client and ML stack, so they
+# are imported inside the commands that need them to keep --help and startup fast
 app = typer.Typer()
 
+# One deployment:replicas pair from a bulk scale config
+_SCALE_PAIR = re.compile(r'\s*([^,:\s][^,:]*?)\s*:\s*(-?\d+)\s*')
+
+# Streaming listings flush in chunks of this many rows (one LIST page)
+_FLUSH_ROWS = 500
+
+_STATUS_EMOJI = {'success': '✅', 'failed': '❌', 'blocked': '🚫', 'simulated': '🧪'}
+_SEVERITY_EMOJI = {'critical': '🔴', 'high': '🟠', 'medium': '🟡', 'low': '🟢'}
+_PRIORITY_EMOJI = _SEVERITY_EMOJI
+
+
+def _write_json(data):
+    """Write JSON to stdout: indented for a terminal, compact when piped"""
+    pretty = sys.stdout.isatty()
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            payload = orjson.dumps(data, option=option)
+        except TypeError:
+            payload = None  # fall back to the stdlib encoder below
+        if payload is not None:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(payload)
+            sys.stdout.buffer.flush()
+            return
+    json.dump(data, sys.stdout, indent=2 if pretty else None)
+    sys.stdout.write("\n")
+
+
+def _parse_csv(value: str) -> Tuple[str, ...]:
+    """Split a comma-separated CLI list, dropping blanks and duplicates but keeping order"""
+    return tuple(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
+
+
+def _parse_scale_config(value: str) -> Dict[str, int]:
+    """Parse app1:3,app2:5 into a replica map, rejecting malformed entries"""
+    config = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        match = _SCALE_PAIR.fullmatch(item)
+        if not match:
+            raise typer.BadParameter(f"invalid entry {item.strip()!r}, expected name:replicas", param_hint="'--config'")
+        name, replicas = match.groups()
+        config[name] = int(replicas)
+    return config
+
+
+def _write_lines(lines):
+    """Write all lines to stdout in a single call"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _parallel_map(fn, items, workers: int = 16):
+    """Run fn over items on a thread pool, yielding results in input order as soon as each is ready"""
+    items = list(items)
+    if not items:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(items)))) as executor:
+        yield from executor.map(fn, items)
+
+
+def _stream_lines(lines):
+    """Write each line to stdout as it arrives, so long bulk runs show progress"""
+    for line in lines:
+        sys.stdout.write(f"{line}\n")
+        sys.stdout.flush()
+
+
+def _load_cluster(kubeconfig_path: Optional[str]):
+    """Load the cluster config, skipping the reload when this unchanged kubeconfig is already active"""
+    from k8s_connector.cluster_connector import load_cluster, is_kubeconfig_active
+    if kubeconfig_path is not None and is_kubeconfig_active(kubeconfig_path):
+        return {"status": "connected", "cluster_name": "Kubernetes Cluster", "path": kubeconfig_path}
+    return load_cluster(kubeconfig_path)
+
+
+# --kubeconfig given before the command name; each command loads it when it actually runs
+_kubeconfig_path: Optional[str] = None
+
+
+@app.callback()
+def main(
+    kubeconfig_path: Optional[str] = typer.Option(None, "--kubeconfig", help="Path to the kubeconfig (required by every command except connect)")
+):
+    """AutoKubeX - AI-powered Kubernetes operations."""
+    # Only record the path: the callback runs before a subcommand handles --help
+    global _kubeconfig_path
+    _kubeconfig_path = kubeconfig_path
+
+
+def _require_cluster():
+    """Load the kubeconfig passed to the app, failing like a missing required option when there is none"""
+    if _kubeconfig_path is None:
+        raise typer.BadParameter("a kubeconfig path is required", param_hint="'--kubeconfig'")
+    _load_cluster(_kubeconfig_path)
+
+
 @app.command()
 def connect(cluster_config: str):
     """Connect to a Kubernetes cluster."""
-    load_cluster(cluster_config)
+    _load_cluster(cluster_config)
     typer.echo("✔️ Connected.")
 
 @app.command()
-def diagnose(kubeconfig_path: str = typer.Option(..., "--kubeconfig")):
+def diagnose():
     """Run AI diagnosis from CLI."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from ai_engine.planner import diagnose_cluster
     result = diagnose_cluster()
     typer.echo(result["ai_response"])
 
 @app.command()
 def restart_pod_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
     pod_name: str = typer.Option(..., "--pod", "-p")
 ):
     """Restart a specific pod."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from actions.restarter import restart_pod
     result = restart_pod(namespace, pod_name)
     typer.echo(result)
 
 @app.command()
 def delete_pod_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
     pod_name: str = typer.Option(..., "--pod", "-p")
 ):
     """Delete a specific pod."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from actions.restarter import delete_pod
     result = delete_pod(namespace, pod_name)
     typer.echo(result)
 
 @app.command()
 def restart_deployment_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
     deployment_name: str = typer.Option(..., "--deployment", "-d")
 ):
     """Restart all pods in a deployment."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from actions.restarter import restart_deployment
     result = restart_deployment(namespace, deployment_name)
     typer.echo(result)
 
 @app.command()
 def scale_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
     deployment: str = typer.Option(..., "--deployment", "-d"),
     replicas: int = typer.Option(..., "--replicas", "-r")
 ):
     """Scale a deployment to specified number of replicas."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from actions.scaler import scale_deployment
     result = scale_deployment(namespace, deployment, replicas)
     typer.echo(result)
 
 @app.command()
 def list_pods(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: Optional[str] = typer.Option(None, "--namespace", "-n")
 ):
     """List all pods with their status."""
-    load_cluster(kubeconfig_path)
-    pods = get_all_pods(namespace)
+    _require_cluster()
+    from actions.action_handler import iter_all_pods
     
     typer.echo("\n📋 Pod Status:")
     typer.echo("-" * 80)
-    for pod in pods:
+    # Rows are flushed a page at a time as the LIST arrives rather than after the full listing
+    rows = []
+    for pod in iter_all_pods(namespace):
         if 'error' in pod:
-            typer.echo(f"❌ {pod['error']}")
-            continue
-        
-        status = "✅" if pod['ready'] else "❌"
-        typer.echo(f"{status} {pod['namespace']}/{pod['name']} | {pod['phase']} | Restarts: {pod['restarts']}")
+            rows.append(f"❌ {pod['error']}")
+        else:
+            status = "✅" if pod['ready'] else "❌"
+            rows.append(f"{status} {pod['namespace']}/{pod['name']} | {pod['phase']} | Restarts: {pod['restarts']}")
+        if len(rows) >= _FLUSH_ROWS:
+            _write_lines(rows)
+            rows = []
+    _write_lines(rows)
 
 @app.command()
 def list_deployments_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: Optional[str] = typer.Option(None, "--namespace", "-n")
 ):
     """List all deployments with their status."""
-    load_cluster(kubeconfig_path)
-    deployments = get_all_deployments(namespace)
+    _require_cluster()
+    from actions.action_handler import iter_all_deployments
     
     typer.echo("\n🚀 Deployment Status:")
     typer.echo("-" * 80)
-    for dep in deployments:
+    rows = []
+    for dep in iter_all_deployments(namespace):
         if 'error' in dep:
-            typer.echo(f"❌ {dep['error']}")
-            continue
-        
-        status = "✅" if dep['ready_replicas'] == dep['replicas'] else "❌"
-        typer.echo(f"{status} {dep['namespace']}/{dep['name']} | {dep['ready_replicas']}/{dep['replicas']} ready")
+            rows.append(f"❌ {dep['error']}")
+        else:
+            status = "✅" if dep['ready_replicas'] == dep['replicas'] else "❌"
+            rows.append(f"{status} {dep['namespace']}/{dep['name']} | {dep['ready_replicas']}/{dep['replicas']} ready")
+        if len(rows) >= _FLUSH_ROWS:
+            _write_lines(rows)
+            rows = []
+    _write_lines(rows)
 
 @app.command()
-def problems(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig")
-):
+def problems():
     """List problematic pods that need attention."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from actions.action_handler import get_problematic_pods
     pods = get_problematic_pods()
     
     if not pods:
@@ -120,160 +233,165 @@ def problems(
     
     typer.echo("\n⚠️  Problematic Pods:")
     typer.echo("-" * 80)
-    for pod in pods:
-        typer.echo(f"❌ {pod['namespace']}/{pod['name']} | {pod['phase']} | Restarts: {pod['restarts']}")
+    _write_lines([
+        f"❌ {pod['namespace']}/{pod['name']} | {pod['phase']} | Restarts: {pod['restarts']}" for pod in pods
+    ])
 
 
 @app.command()
 def bulk_restart_pods_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
-    pod_names: str = typer.Option(..., "--pods", "-p", help="Comma-separated list of pod names")
+    pod_names: str = typer.Option(..., "--pods", "-p", help="Comma-separated list of pod names"),
+    concurrency: int = typer.Option(16, "--concurrency", help="Maximum number of concurrent API calls")
 ):
     """Restart multiple pods in bulk."""
-    load_cluster(kubeconfig_path)
-    pod_list = [name.strip() for name in pod_names.split(",")]
-    results = bulk_restart_pods(namespace, pod_list)
+    _require_cluster()
+    from actions.restarter import restart_pod
+    pod_list = _parse_csv(pod_names)
+    
+    if not pod_list:
+        typer.echo("❌ No pod names given. Use: pod1,pod2")
+        return
     
     typer.echo("\n🔄 Bulk Pod Restart Results:")
     typer.echo("-" * 80)
-    for pod_name, result in results.items():
-        typer.echo(f"{result}")
+    _stream_lines(_parallel_map(lambda pod_name: restart_pod(namespace, pod_name), pod_list, workers=concurrency))
 
 
 @app.command()
 def bulk_delete_pods_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
-    pod_names: str = typer.Option(..., "--pods", "-p", help="Comma-separated list of pod names")
+    pod_names: str = typer.Option(..., "--pods", "-p", help="Comma-separated list of pod names"),
+    concurrency: int = typer.Option(16, "--concurrency", help="Maximum number of concurrent API calls")
 ):
     """Delete multiple pods in bulk."""
-    load_cluster(kubeconfig_path)
-    pod_list = [name.strip() for name in pod_names.split(",")]
-    results = bulk_delete_pods(namespace, pod_list)
+    _require_cluster()
+    from actions.restarter import delete_pod
+    pod_list = _parse_csv(pod_names)
+    
+    if not pod_list:
+        typer.echo("❌ No pod names given. Use: pod1,pod2")
+        return
     
     typer.echo("\n🗑️  Bulk Pod Delete Results:")
     typer.echo("-" * 80)
-    for pod_name, result in results.items():
-        typer.echo(f"{result}")
+    _stream_lines(_parallel_map(lambda pod_name: delete_pod(namespace, pod_name), pod_list, workers=concurrency))
 
 
 @app.command()
 def bulk_restart_deployments_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
-    deployment_names: str = typer.Option(..., "--deployments", "-d", help="Comma-separated list of deployment names")
+    deployment_names: str = typer.Option(..., "--deployments", "-d", help="Comma-separated list of deployment names"),
+    concurrency: int = typer.Option(16, "--concurrency", help="Maximum number of concurrent API calls")
 ):
     """Restart multiple deployments in bulk."""
-    load_cluster(kubeconfig_path)
-    deployment_list = [name.strip() for name in deployment_names.split(",")]
-    results = bulk_restart_deployments(namespace, deployment_list)
+    _require_cluster()
+    from actions.restarter import restart_deployment
+    deployment_list = _parse_csv(deployment_names)
+    
+    if not deployment_list:
+        typer.echo("❌ No deployment names given. Use: app1,app2")
+        return
     
     typer.echo("\n🔄 Bulk Deployment Restart Results:")
     typer.echo("-" * 80)
-    for deployment_name, result in results.items():
-        typer.echo(f"{result}")
+    _stream_lines(_parallel_map(lambda deployment_name: restart_deployment(namespace, deployment_name), deployment_list, workers=concurrency))
 
 
 @app.command()
 def bulk_delete_deployments_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
-    deployment_names: str = typer.Option(..., "--deployments", "-d", help="Comma-separated list of deployment names")
+    deployment_names: str = typer.Option(..., "--deployments", "-d", help="Comma-separated list of deployment names"),
+    concurrency: int = typer.Option(16, "--concurrency", help="Maximum number of concurrent API calls")
 ):
     """Delete multiple deployments in bulk."""
-    load_cluster(kubeconfig_path)
-    deployment_list = [name.strip() for name in deployment_names.split(",")]
-    results = bulk_delete_deployments(namespace, deployment_list)
+    _require_cluster()
+    from actions.restarter import delete_deployment
+    deployment_list = _parse_csv(deployment_names)
+    
+    if not deployment_list:
+        typer.echo("❌ No deployment names given. Use: app1,app2")
+        return
     
     typer.echo("\n🗑️  Bulk Deployment Delete Results:")
     typer.echo("-" * 80)
-    for deployment_name, result in results.items():
-        typer.echo(f"{result}")
+    _stream_lines(_parallel_map(lambda deployment_name: delete_deployment(namespace, deployment_name), deployment_list, workers=concurrency))
 
 
 @app.command()
 def bulk_scale_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
-    deployments_config: str = typer.Option(..., "--config", "-c", help="deployment1:replicas1,deployment2:replicas2")
+    deployments_config: str = typer.Option(..., "--config", "-c", help="deployment1:replicas1,deployment2:replicas2"),
+    concurrency: int = typer.Option(16, "--concurrency", help="Maximum number of concurrent API calls")
 ):
     """Scale multiple deployments in bulk. Format: app1:3,app2:5,app3:0"""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from actions.scaler import scale_deployment
     
-    config_dict = {}
-    for item in deployments_config.split(","):
-        if ":" in item:
-            deployment, replicas = item.strip().split(":")
-            config_dict[deployment] = int(replicas)
+    config_dict = _parse_scale_config(deployments_config)
     
     if not config_dict:
         typer.echo("❌ Invalid configuration format. Use: app1:3,app2:5,app3:0")
         return
     
-    results = bulk_scale_deployments(namespace, config_dict)
-    
     typer.echo("\n📏 Bulk Scale Results:")
     typer.echo("-" * 80)
-    for deployment_name, result in results.items():
-        typer.echo(f"{result}")
+    _stream_lines(_parallel_map(lambda item: scale_deployment(namespace, *item), config_dict.items(), workers=concurrency))
 
 
 @app.command()
 def scale_all_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
     replicas: int = typer.Option(..., "--replicas", "-r"),
     label_selector: Optional[str] = typer.Option(None, "--selector", "-s")
 ):
     """Scale all deployments in a namespace to the same number of replicas."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from actions.scaler import scale_all_deployments_in_namespace
     results = scale_all_deployments_in_namespace(namespace, replicas, label_selector)
     
     typer.echo(f"\n📏 Scale All Deployments to {replicas} replicas:")
     typer.echo("-" * 80)
-    for deployment_name, result in results.items():
-        typer.echo(f"{result}")
+    _write_lines([str(result) for result in results.values()])
 
 
 @app.command()
 def scale_by_percentage_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
     deployment: str = typer.Option(..., "--deployment", "-d"),
     percentage: float = typer.Option(..., "--percentage", "-p", help="Scaling factor (e.g., 1.5 for 50% increase, 0.5 for 50% decrease)")
 ):
     """Scale a deployment by percentage."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from actions.scaler import scale_deployment_by_percentage
     result = scale_deployment_by_percentage(namespace, deployment, percentage)
     typer.echo(result)
 
 
 @app.command()
 def restart_namespace_cmd(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     namespace: str = typer.Option(..., "--namespace", "-n"),
     label_selector: Optional[str] = typer.Option(None, "--selector", "-s")
 ):
     """Restart all pods in a namespace (optionally filtered by label selector)."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from actions.restarter import restart_all_pods_in_namespace
     results = restart_all_pods_in_namespace(namespace, label_selector)
     
     typer.echo(f"\n🔄 Restart All Pods in Namespace {namespace}:")
     typer.echo("-" * 80)
-    for pod_name, result in results.items():
-        typer.echo(f"{result}")
+    _write_lines([str(result) for result in results.values()])
 
 
 @app.command()
 def autonomous_fix(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     prompt: Optional[str] = typer.Option(None, "--prompt", "-p", help="Custom analysis prompt"),
     dry_run: bool = typer.Option(True, "--dry-run/--execute", help="Dry run mode (default) or execute actions"),
     show_safety: bool = typer.Option(False, "--show-safety", help="Show safety constraints")
 ):
     """Run autonomous AI diagnosis and fixes."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from ai_engine.autonomous_agent import run_autonomous_diagnosis, AutonomousAgent
     
     if show_safety:
         agent = AutonomousAgent(dry_run=True)
@@ -301,33 +419,35 @@ def autonomous_fix(
         typer.echo(f"\n🛠️  Action Plan ({len(result['action_plan'])} actions):")
         typer.echo("-" * 60)
         
+        blocks = []
         for i, action in enumerate(result['execution_results'], 1):
-            status_emoji = {
-                'success': '✅',
-                'failed': '❌', 
-                'blocked': '🚫',
-                'simulated': '🧪'
-            }.get(action['status'], '❓')
-            
-            typer.echo(f"{i}. {status_emoji} {action['action']}")
-            typer.echo(f"   Reason: {action['reason']}")
-            typer.echo(f"   Status: {action['message']}")
+            status_emoji = _STATUS_EMOJI.get(action['status'], '❓')
+            block = (
+                f"{i}. {status_emoji} {action['action']}\n"
+                f"   Reason: {action['reason']}\n"
+                f"   Status: {action['message']}\n"
+            )
             if action.get('parameters'):
-                typer.echo(f"   Params: {action['parameters']}")
-            typer.echo("")
+                block += f"   Params: {action['parameters']}\n"
+            blocks.append(block)
+        _write_lines(blocks)
     else:
         typer.echo("\n✅ No issues detected - cluster is healthy!")
 
 
 @app.command()
 def autonomous_monitor(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     interval: int = typer.Option(5, "--interval", help="Check interval in minutes"),
     cycles: int = typer.Option(10, "--cycles", help="Number of monitoring cycles"),
     dry_run: bool = typer.Option(True, "--dry-run/--execute", help="Dry run mode (default) or execute actions")
 ):
     """Run continuous autonomous monitoring and fixing."""
-    load_cluster(kubeconfig_path)
+    _require_cluster()
+    from ai_engine.autonomous_agent import run_continuous_monitoring
+    from k8s_connector.cluster_cache import ClusterStateCache
+    
+    # Keep pods/deployments in a watch cache so each cycle reads memory instead of re-listing
+    ClusterStateCache.ensure_started()
     
     mode = "🧪 DRY RUN MODE" if dry_run else "🚀 EXECUTION MODE"
     typer.echo(f"{mode} - Starting continuous autonomous monitoring...")
@@ -343,24 +463,19 @@ def autonomous_monitor(
     
     if history:
         typer.echo("\n🔍 Action Summary:")
+        lines = []
         for action in history[-5:]:  # Show last 5 actions
-            status_emoji = {
-                'success': '✅',
-                'failed': '❌',
-                'blocked': '🚫', 
-                'simulated': '🧪'
-            }.get(action['status'], '❓')
-            typer.echo(f"  {status_emoji} {action['action']} - {action['message']}")
+            status_emoji = _STATUS_EMOJI.get(action['status'], '❓')
+            lines.append(f"  {status_emoji} {action['action']} - {action['message']}")
+        _write_lines(lines)
 
 
 @app.command()
 def ai_analysis(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     output_format: str = typer.Option("summary", "--format", "-f", help="Output format: summary, detailed, json")
 ):
     """Run advanced AI analysis on the cluster using ML libraries."""
-    load_cluster(kubeconfig_path)
-    
+    _require_cluster()
     try:
         from ai_engine.k8s_ai_analyzer import run_advanced_cluster_analysis
         
@@ -372,7 +487,7 @@ def ai_analysis(
             return
         
         if output_format == "json":
-            typer.echo(json.dumps(analysis, indent=2))
+            _write_json(analysis)
             return
         
         # Summary format
@@ -392,8 +507,7 @@ def ai_analysis(
         if critical_issues:
             typer.echo(f"\n🚨 Critical Issues ({len(critical_issues)}):")
             for i, issue in enumerate(critical_issues[:5], 1):
-                severity_emoji = {'critical': '🔴', 'high': '🟠', 'medium': '🟡', 'low': '🟢'}
-                emoji = severity_emoji.get(issue.get('severity', 'low'), '🔵')
+                emoji = _SEVERITY_EMOJI.get(issue.get('severity', 'low'), '🔵')
                 typer.echo(f"  {i}. {emoji} {issue.get('type', 'Unknown')}: {issue.get('message', 'No details')}")
                 if 'recommended_action' in issue:
                     typer.echo(f"     → Action: {issue['recommended_action']}")
@@ -411,13 +525,12 @@ def ai_analysis(
         if recommendations:
             typer.echo(f"\n💡 AI Recommendations ({len(recommendations)}):")
             for i, rec in enumerate(recommendations[:3], 1):
-                priority_emoji = {'critical': '🔴', 'high': '🟠', 'medium': '🟡', 'low': '🟢'}
-                emoji = priority_emoji.get(rec.get('priority', 'low'), '🔵')
+                emoji = _PRIORITY_EMOJI.get(rec.get('priority', 'low'), '🔵')
                 typer.echo(f"  {i}. {emoji} {rec.get('message', 'No details')}")
         
         if output_format == "detailed":
             typer.echo(f"\n📋 Full Analysis:")
-            typer.echo(json.dumps(analysis, indent=2))
+            _write_json(analysis)
         
     except Exception as e:
         typer.echo(f"❌ AI analysis failed: {e}")
@@ -425,13 +538,11 @@ def ai_analysis(
 
 @app.command() 
 def predictive_analysis(
-    kubeconfig_path: str = typer.Option(..., "--kubeconfig"),
     deployment: str = typer.Option(None, "--deployment", "-d", help="Specific deployment to analyze"),
     namespace: str = typer.Option("default", "--namespace", "-n"),
 ):
     """Run predictive analysis for cluster management."""
-    load_cluster(kubeconfig_path)
-    
+    _require_cluster()
     try:
         from ai_engine.autonomous_agent import AutonomousAgent
         
@@ -490,5 +601,6 @@ def diagnose_cluster_from_path(kubeconfig_path: str, custom_prompt: str = None):
     Load cluster, run diagnose_cluster, and return a dict of:
       prompt, cluster_snapshot, ai_response
     """
-    load_cluster(kubeconfig_path)
+    from ai_engine.planner import diagnose_cluster
+    _load_cluster(kubeconfig_path)
     return diagnose_cluster(prompt_override=custom_prompt)
@@ -1,11 +1,38 @@
 import streamlit as st
 import os
 import json
-import hashlib
+import logging
+import secrets
+import sqlite3
 import tempfile
+import threading
+import yaml
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from k8s_connector.cluster_connector import load_cluster
+from typing import Optional, Dict, Any, List
+from k8s_connector.cluster_connector import load_cluster, is_kubeconfig_active
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(data: Any) -> str:
+    """Serialize session data to a JSON string"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
+def _loads(data: str) -> Any:
+    """Deserialize session data from a JSON string"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class SessionManager:
     """Manages persistent sessions for AutoKubeX web UI"""
@@ -13,122 +40,142 @@ class SessionManager:
     def __init__(self):
         self.session_dir = os.path.join(tempfile.gettempdir(), "autokubex_sessions")
         self.ensure_session_dir()
+        self._sid: Optional[str] = None
+        # Errors are logged and collected here; the owning page shows them with drain_errors()
+        self._errors: List[str] = []
+        
+        # One SQLite store for all sessions; WAL keeps reads from blocking on writes
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(self.session_dir, 'sessions.db'),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, last_updated TEXT NOT NULL, data_json TEXT NOT NULL)"
+        )
+        # Expiry sweeps and listings filter on last_updated; the index keeps them off a full scan
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_last_updated ON sessions (last_updated)")
         
     def ensure_session_dir(self):
         """Create session directory if it doesn't exist"""
-        if not os.path.exists(self.session_dir):
-            os.makedirs(self.session_dir)
+        os.makedirs(self.session_dir, exist_ok=True)
     
     def get_session_id(self) -> str:
         """Get or create a unique session ID"""
+        if self._sid is not None:
+            return self._sid
         if 'session_id' not in st.session_state:
-            # Create unique session ID based on timestamp and random data
-            session_data = f"{datetime.now().isoformat()}_{os.urandom(16).hex()}"
-            st.session_state.session_id = hashlib.md5(session_data.encode()).hexdigest()
-        return st.session_state.session_id
+            # 128 random bits, hex-encoded like the md5 digests used previously
+            st.session_state.session_id = secrets.token_hex(16)
+        self._sid = st.session_state.session_id
+        return self._sid
     
-    def get_session_file_path(self, session_id: str) -> str:
-        """Get the file path for a session"""
-        return os.path.join(self.session_dir, f"session_{session_id}.json")
+    def _expiry_cutoff(self) -> str:
+        """ISO timestamp before which sessions are expired (24 hours)"""
+        return (datetime.now() - timedelta(hours=24)).isoformat()
     
     def save_session_data(self, data: Dict[str, Any]) -> bool:
-        """Save session data to file"""
+        """Save session data to the session store"""
         try:
             session_id = self.get_session_id()
-            session_file = self.get_session_file_path(session_id)
-            
-            # Add metadata
-            data_with_metadata = {
-                'session_id': session_id,
-                'last_updated': datetime.now().isoformat(),
-                'data': data
-            }
-            
-            with open(session_file, 'w') as f:
-                json.dump(data_with_metadata, f, indent=2)
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, last_updated, data_json) VALUES (?, ?, ?)",
+                    (session_id, datetime.now().isoformat(), _dumps(data))
+                )
             return True
         except Exception as e:
-            st.error(f"Failed to save session: {e}")
+            self._report_error(f"Failed to save session: {e}")
             return False
     
     def load_session_data(self, session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """Load session data from file"""
+        """Load session data from the session store"""
         try:
             if session_id is None:
                 session_id = self.get_session_id()
             
-            session_file = self.get_session_file_path(session_id)
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT last_updated, data_json FROM sessions WHERE session_id = ?",
+                    (session_id,)
+                ).fetchone()
             
-            if not os.path.exists(session_file):
+            if row is None:
                 return None
-                
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
             
             # Check if session is expired (24 hours)
-            last_updated = datetime.fromisoformat(session_data['last_updated'])
-            if datetime.now() - last_updated > timedelta(hours=24):
+            last_updated, data_json = row
+            if last_updated <= self._expiry_cutoff():
                 self.cleanup_session(session_id)
                 return None
             
-            return session_data['data']
+            return _loads(data_json)
         except Exception as e:
-            st.error(f"Failed to load session: {e}")
+            self._report_error(f"Failed to load session: {e}")
+            return None
+    
+    def dump_pretty(self, session_id: Optional[str] = None) -> Optional[str]:
+        """Return a stored session as indented JSON for manual inspection"""
+        data = self.load_session_data(session_id)
+        if data is None:
             return None
+        return json.dumps(data, indent=2)
     
     def cleanup_session(self, session_id: str) -> bool:
-        """Remove session file"""
+        """Remove a session from the session store"""
         try:
-            session_file = self.get_session_file_path(session_id)
-            if os.path.exists(session_file):
-                os.remove(session_file)
+            with self._db_lock:
+                self._db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
             return True
         except Exception as e:
-            st.error(f"Failed to cleanup session: {e}")
+            self._report_error(f"Failed to cleanup session: {e}")
             return False
     
     def list_active_sessions(self) -> Dict[str, Dict[str, str]]:
         """List all active sessions with metadata"""
         sessions = {}
         try:
-            for filename in os.listdir(self.session_dir):
-                if filename.startswith('session_') and filename.endswith('.json'):
-                    session_id = filename.replace('session_', '').replace('.json', '')
-                    session_file = os.path.join(self.session_dir, filename)
-                    
-                    try:
-                        with open(session_file, 'r') as f:
-                            session_data = json.load(f)
-                        
-                        # Check if session is expired
-                        last_updated = datetime.fromisoformat(session_data['last_updated'])
-                        if datetime.now() - last_updated > timedelta(hours=24):
-                            self.cleanup_session(session_id)
-                            continue
-                        
-                        sessions[session_id] = {
-                            'last_updated': session_data['last_updated'],
-                            'has_cluster': 'kubeconfig_path' in session_data.get('data', {}),
-                            'cluster_name': session_data.get('data', {}).get('cluster_name', 'Unknown')
-                        }
-                    except Exception:
-                        continue
+            cutoff = self._expiry_cutoff()
+            with self._db_lock:
+                self._db.execute("DELETE FROM sessions WHERE last_updated <= ?", (cutoff,))
+                rows = self._db.execute(
+                    "SELECT session_id, last_updated, "
+                    "json_type(data_json, '$.kubeconfig_path') IS NOT NULL, "
+                    "json_extract(data_json, '$.cluster_name') "
+                    "FROM sessions WHERE last_updated > ?",
+                    (cutoff,)
+                ).fetchall()
+            
+            for session_id, last_updated, has_cluster, cluster_name in rows:
+                sessions[session_id] = {
+                    'last_updated': last_updated,
+                    'has_cluster': bool(has_cluster),
+                    'cluster_name': cluster_name or 'Unknown'
+                }
         except Exception as e:
-            st.error(f"Failed to list sessions: {e}")
+            self._report_error(f"Failed to list sessions: {e}")
         
         return sessions
     
     def restore_cluster_connection(self, kubeconfig_path: str) -> bool:
         """Restore cluster connection from saved session"""
         try:
+            # Streamlit reruns keep the process alive, so the config loaded earlier is still active
+            if is_kubeconfig_active(kubeconfig_path):
+                return True
             if os.path.exists(kubeconfig_path):
                 load_cluster(kubeconfig_path)
                 return True
             else:
-                st.warning("Saved kubeconfig file no longer exists. Please re-upload.")
+                logger.warning("Saved kubeconfig %s no longer exists", kubeconfig_path)
+                self._errors.append("Saved kubeconfig file no longer exists. Please re-upload.")
                 return False
         except Exception as e:
-            st.error(f"Failed to restore cluster connection: {e}")
+            self._report_error(f"Failed to restore cluster connection: {e}")
             return False
     
     def init_session_state(self):
@@ -154,11 +201,26 @@ class SessionManager:
             session_id = self.get_session_id()
             kubeconfig_path = os.path.join(self.session_dir, f"kubeconfig_{session_id}.yaml")
             
-            with open(kubeconfig_path, 'wb') as f:
-                f.write(kubeconfig_content)
+            # Skip the reload when this session is already connected with the same kubeconfig
+            already_loaded = False
+            if st.session_state.get('cluster_connected') and st.session_state.get('kubeconfig_path') == kubeconfig_path:
+                try:
+                    with open(kubeconfig_path, 'rb') as f:
+                        already_loaded = f.read() == kubeconfig_content
+                except OSError:
+                    already_loaded = False
             
-            # Test cluster connection
-            load_cluster(kubeconfig_path)
+            if not already_loaded:
+                # Owner-only and fsynced: the kubeconfig holds credentials and must not be left half-written
+                fd = os.open(kubeconfig_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, 'wb') as f:
+                    os.fchmod(fd, 0o600)
+                    f.write(kubeconfig_content)
+                    f.flush()
+                    os.fsync(fd)
+                
+                # Test cluster connection from the bytes already in memory
+                load_cluster(kubeconfig_path, config_dict=yaml.safe_load(kubeconfig_content))
             
             # Save session data
             session_data = {
@@ -178,11 +240,15 @@ class SessionManager:
             
             return False
         except Exception as e:
-            st.error(f"Failed to start session: {e}")
+            self._report_error(f"Failed to start session: {e}")
             return False
     
     def restore_session(self) -> bool:
         """Restore session from saved data"""
+        # Already restored on an earlier rerun
+        if st.session_state.get('cluster_connected') and st.session_state.get('kubeconfig_path'):
+            return True
+        
         try:
             session_data = self.load_session_data()
             if not session_data:
@@ -200,7 +266,7 @@ class SessionManager:
             
             return False
         except Exception as e:
-            st.error(f"Failed to restore session: {e}")
+            self._report_error(f"Failed to restore session: {e}")
             return False
     
     def end_session(self) -> bool:
@@ -208,14 +274,16 @@ class SessionManager:
         try:
             session_id = self.get_session_id()
             
-            # Cleanup session file
+            # Remove stored session data
             self.cleanup_session(session_id)
+            self._sid = None
             
             # Cleanup kubeconfig file
             if st.session_state.get('kubeconfig_path'):
-                kubeconfig_path = st.session_state.kubeconfig_path
-                if os.path.exists(kubeconfig_path):
-                    os.remove(kubeconfig_path)
+                try:
+                    os.remove(st.session_state.kubeconfig_path)
+                except FileNotFoundError:
+                    pass
             
             # Reset session state
             for key in ['cluster_connected', 'kubeconfig_path', 'cluster_name', 
@@ -227,9 +295,20 @@ class SessionManager:
             st.rerun()
             return True
         except Exception as e:
-            st.error(f"Failed to end session: {e}")
+            self._report_error(f"Failed to end session: {e}")
             return False
     
+    def _report_error(self, message: str):
+        """Log the exception being handled with its traceback and queue the message for drain_errors()"""
+        logger.exception(message)
+        self._errors.append(message)
+    
+    def drain_errors(self):
+        """Show all errors collected since the last render in a single message"""
+        if self._errors:
+            st.error("\n\n".join(self._errors))
+            self._errors = []
+    
     def get_session_info(self) -> Dict[str, str]:
         """Get current session information"""
         return {
@@ -2,10 +2,26 @@ import streamlit as st
 import os
 import json
 import tempfile
-import hashlib
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from k8s_connector.cluster_connector import load_cluster
+import functools
+import shutil
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple, Union, BinaryIO
+from k8s_connector.cluster_connector import load_cluster, is_kubeconfig_active
+
+# How long a successful connection probe is trusted before auto_restore re-checks
+PROBE_TTL_SECONDS = 300
+SESSION_TTL_SECONDS = 48 * 3600
+
+@functools.lru_cache(maxsize=4)
+def _read_session(path: str, mtime_ns: int) -> Tuple[Dict[str, Any], float]:
+    """Parse a session file once per modification; reruns get the memoized record and its epoch"""
+    with open(path, 'rb') as f:
+        session_data = json.loads(f.read())
+    saved_ts = session_data.get('saved_ts')
+    if saved_ts is None:
+        saved_ts = datetime.fromisoformat(session_data['saved_at']).timestamp()
+    return session_data, saved_ts
 
 class SimpleSessionManager:
     """Simplified session manager that just works without complex UI"""
@@ -14,22 +30,34 @@ class SimpleSessionManager:
         self.session_file = os.path.join(tempfile.gettempdir(), "autokubex_session.json")
         self.kubeconfig_file = os.path.join(tempfile.gettempdir(), "autokubex_kubeconfig.yaml")
     
-    def save_session(self, kubeconfig_content: bytes, cluster_name: str = None) -> bool:
-        """Save session data simply"""
+    def save_session(self, kubeconfig_content: Union[bytes, BinaryIO], cluster_name: str = None) -> bool:
+        """Save session data simply; kubeconfig_content may be bytes or a binary file object to stream"""
         try:
-            # Save kubeconfig
+            # Save kubeconfig, streaming file objects in 64 KiB chunks
             with open(self.kubeconfig_file, 'wb') as f:
-                f.write(kubeconfig_content)
+                if isinstance(kubeconfig_content, (bytes, bytearray)):
+                    f.write(kubeconfig_content)
+                else:
+                    kubeconfig_content.seek(0)
+                    shutil.copyfileobj(kubeconfig_content, f, length=1 << 16)
+                f.flush()
+                os.fsync(f.fileno())
             
-            # Save session info
+            # Save session info, replacing the file atomically so a crash never leaves it truncated
+            saved_ts = time.time()
             session_data = {
                 'cluster_name': cluster_name or 'Kubernetes Cluster',
-                'saved_at': datetime.now().isoformat(),
+                'saved_at': datetime.fromtimestamp(saved_ts).isoformat(),
+                'saved_ts': saved_ts,
                 'kubeconfig_path': self.kubeconfig_file
             }
             
-            with open(self.session_file, 'w') as f:
-                json.dump(session_data, f)
+            tmp_path = f"{self.session_file}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(session_data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.session_file)
+            _read_session.cache_clear()
+            st.session_state.pop('session_expiry_ts', None)
             
             return True
         except Exception as e:
@@ -38,20 +66,25 @@ class SimpleSessionManager:
     
     def load_session(self) -> Optional[Dict[str, Any]]:
         """Load session data if available"""
+        # Reruns within the known expiry return the record without touching the filesystem
+        expiry_ts = st.session_state.get('session_expiry_ts')
+        if expiry_ts and time.time() < expiry_ts:
+            return st.session_state['_cached_session_data']
+        
         try:
-            if not os.path.exists(self.session_file) or not os.path.exists(self.kubeconfig_file):
-                return None
-            
-            with open(self.session_file, 'r') as f:
-                session_data = json.load(f)
+            mtime_ns = os.stat(self.session_file).st_mtime_ns
+            session_data, saved_ts = _read_session(self.session_file, mtime_ns)
             
             # Check if session is still valid (48 hours)
-            saved_at = datetime.fromisoformat(session_data['saved_at'])
-            if datetime.now() - saved_at > timedelta(hours=48):
+            if time.time() - saved_ts > SESSION_TTL_SECONDS:
                 self.clear_session()
                 return None
             
+            st.session_state['_cached_session_data'] = session_data
+            st.session_state['session_expiry_ts'] = saved_ts + SESSION_TTL_SECONDS
             return session_data
+        except FileNotFoundError:
+            return None
         except Exception:
             return None
     
@@ -60,6 +93,8 @@ class SimpleSessionManager:
         try:
             if not os.path.exists(self.kubeconfig_file):
                 return False
+            if is_kubeconfig_active(self.kubeconfig_file):
+                return True
             load_cluster(self.kubeconfig_file)
             return True
         except Exception:
@@ -68,16 +103,26 @@ class SimpleSessionManager:
     def clear_session(self) -> bool:
         """Clear session files"""
         try:
-            if os.path.exists(self.session_file):
-                os.remove(self.session_file)
-            if os.path.exists(self.kubeconfig_file):
-                os.remove(self.kubeconfig_file)
+            for path in (self.session_file, self.kubeconfig_file):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            # Drop memoized state so nothing serves the removed session
+            _read_session.cache_clear()
+            st.session_state.pop('last_probe', None)
+            st.session_state.pop('session_expiry_ts', None)
             return True
         except Exception:
             return False
     
     def auto_restore(self) -> bool:
         """Automatically restore session if available"""
+        # Reruns within the probe TTL skip the session read and cluster probe
+        if (st.session_state.get('cluster_connected')
+                and st.session_state.get('last_probe', 0) > time.time() - PROBE_TTL_SECONDS):
+            return True
+        
         session_data = self.load_session()
         if not session_data:
             return False
@@ -88,6 +133,7 @@ class SimpleSessionManager:
             st.session_state.kubeconfig_path = self.kubeconfig_file
             st.session_state.cluster_name = session_data['cluster_name']
             st.session_state.auto_restored = True
+            st.session_state.last_probe = time.time()
             return True
         else:
             # Clear invalid session
@@ -0,0 +1,157 @@
+"""
+Streamlit caches for cluster list calls and per-kubeconfig helpers
+Reruns within the TTL read from memory instead of re-listing the API server
+"""
+
+import functools
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+from actions.action_handler import get_all_pods, get_all_deployments, get_problematic_pods, get_all_namespaces
+from ai_engine.kubectl_converter import KubectlConverter
+from k8s_connector.cluster_cache import ClusterStateCache
+from k8s_connector.cluster_connector import load_cluster
+from interface.simple_session import SimpleSessionManager
+
+# Seconds a cached listing stays fresh; keyed by kubeconfig path so switching clusters misses
+LIST_TTL_SECONDS = 15
+
+# Resolved once per process; expanduser can hit the password database
+ENV_KUBECONFIG = os.environ.get('KUBECONFIG')
+DEFAULT_KUBECONFIG = os.path.expanduser('~/.kube/config')
+
+# Pending load_cluster calls by path; one worker also keeps loads from racing on the default config
+_connect_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autokubex-connect")
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Per cached listing: [calls, misses]; a miss is a call that reached the API server
+_cache_stats: Dict[str, List[int]] = {}
+
+
+def _observed_listing(fn):
+    """st.cache_data with the listing TTL, counting calls and misses for the debug stats panel"""
+    counts = _cache_stats.setdefault(fn.__name__, [0, 0])
+    
+    @functools.wraps(fn)
+    def load(*args, **kwargs):
+        counts[1] += 1
+        return fn(*args, **kwargs)
+    
+    cached = st.cache_data(ttl=LIST_TTL_SECONDS, show_spinner=False)(load)
+    
+    @functools.wraps(fn)
+    def call(*args, **kwargs):
+        counts[0] += 1
+        return cached(*args, **kwargs)
+    
+    call.clear = cached.clear
+    return call
+
+
+@_observed_listing
+def cached_problematic_pods(kubeconfig_path: str):
+    """Problematic pods for the connected cluster"""
+    return get_problematic_pods(cache=get_cluster_cache(kubeconfig_path))
+
+
+@_observed_listing
+def _pods_by_namespace(kubeconfig_path: str) -> Dict[str, list]:
+    """One all-namespaces pod LIST grouped by namespace; error records land under None"""
+    grouped = {}
+    for pod in get_all_pods(cache=get_cluster_cache(kubeconfig_path)):
+        grouped.setdefault(pod.get('namespace'), []).append(pod)
+    return grouped
+
+
+@_observed_listing
+def cached_all_pods(kubeconfig_path: str, namespace: str = None):
+    """Pods for the connected cluster, optionally limited to one namespace, cut from the grouped listing"""
+    grouped = _pods_by_namespace(kubeconfig_path)
+    if namespace:
+        return grouped.get(None, []) + grouped.get(namespace, [])
+    return [pod for pods in grouped.values() for pod in pods]
+
+
+@_observed_listing
+def cached_all_deployments(kubeconfig_path: str, namespace: str = None):
+    """Deployments for the connected cluster, optionally limited to one namespace"""
+    return get_all_deployments(namespace, cache=get_cluster_cache(kubeconfig_path))
+
+
+@_observed_listing
+def cached_all_namespaces(kubeconfig_path: str):
+    """Namespace names for the connected cluster"""
+    return get_all_namespaces(get_cluster_cache(kubeconfig_path).api_client)
+
+
+def namespaces_or_error(kubeconfig_path: str) -> Tuple[List[str], Optional[str]]:
+    """Namespace names and None, or an empty list and the reason when the cluster could not be listed"""
+    namespaces = cached_all_namespaces(kubeconfig_path)
+    if len(namespaces) == 1 and namespaces[0].startswith("Error: "):
+        return [], namespaces[0][len("Error: "):]
+    return namespaces, None
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def path_exists(path: str) -> bool:
+    """os.path.exists memoized briefly for panels that re-render on every rerun"""
+    return os.path.exists(path)
+
+
+@st.cache_resource(show_spinner=False)
+def get_session_manager() -> SimpleSessionManager:
+    """The session manager only holds file paths, so one instance serves every session and reload"""
+    return SimpleSessionManager()
+
+
+@st.cache_resource(show_spinner=False)
+def get_converter(kubeconfig_path: str) -> KubectlConverter:
+    """One KubectlConverter per kubeconfig, shared across reruns"""
+    return KubectlConverter(kubeconfig_path)
+
+
+def get_cluster_cache(kubeconfig_path: str) -> ClusterStateCache:
+    """
+    The watch-backed pod/deployment cache for this kubeconfig; listings then read from memory
+    One per kubeconfig with its own client, so sessions on different clusters never share or restart each other's
+    """
+    return ClusterStateCache.for_kubeconfig(kubeconfig_path)
+
+
+def stop_cluster_cache(kubeconfig_path: str):
+    """Stop this kubeconfig's watches, e.g. on disconnect"""
+    ClusterStateCache.stop_kubeconfig(kubeconfig_path)
+
+
+def load_cluster_coalesced(kubeconfig_path: str):
+    """load_cluster, sharing one pending call between reruns that ask for the same path"""
+    with _inflight_lock:
+        future = _inflight.get(kubeconfig_path)
+        if future is None:
+            future = _connect_pool.submit(load_cluster, kubeconfig_path)
+            _inflight[kubeconfig_path] = future
+    try:
+        return future.result()
+    finally:
+        with _inflight_lock:
+            if _inflight.get(kubeconfig_path) is future:
+                del _inflight[kubeconfig_path]
+
+
+def clear_cluster_caches():
+    """Drop every cached listing, e.g. on refresh, disconnect or after a write action"""
+    st.session_state.pop('_probs_t', None)
+    for cached in (cached_problematic_pods, _pods_by_namespace, cached_all_pods, cached_all_deployments, cached_all_namespaces):
+        cached.clear()
+
+
+def cache_stats() -> List[Dict[str, int]]:
+    """Call, hit and miss counts per cached listing since the process started"""
+    return [
+        {'cache': name, 'calls': calls, 'hits': calls - misses, 'misses': misses}
+        for name, (calls, misses) in _cache_stats.items()
+    ]
@@ -0,0 +1,44 @@
+"""
+Filtered pickers and result tables for long resource lists
+Large clusters can have thousands of pods; the browser only ever receives a capped slice
+"""
+
+from typing import Any, Dict, List
+
+import pandas as pd
+import streamlit as st
+
+# Most options handed to a single picker
+PICKER_LIMIT = 200
+
+
+def _filter_options(label: str, options: List[str], key: str, limit: int, keep: List[str]) -> List[str]:
+    """Substring-filter options, cap the list and keep current selections available"""
+    query = st.text_input(f"Filter {label}", key=f"{key}_q") if len(options) > limit else ''
+    if query:
+        needle = query.lower()
+        options = [option for option in options if needle in option.lower()]
+    if len(options) > limit:
+        st.caption(f"Showing the first {limit} of {len(options)} matches; refine the filter to narrow it down")
+        options = options[:limit]
+    missing = [value for value in keep if value not in options]
+    return missing + options
+
+
+def searchable_selectbox(label: str, options: List[str], key: str, limit: int = PICKER_LIMIT):
+    """st.selectbox over at most `limit` options, with a filter box when the list is longer"""
+    current = st.session_state.get(key)
+    keep = [current] if current in options else []
+    return st.selectbox(label, _filter_options(label, options, key, limit, keep), key=key)
+
+
+def searchable_multiselect(label: str, options: List[str], key: str, limit: int = PICKER_LIMIT):
+    """st.multiselect over at most `limit` options, with a filter box when the list is longer"""
+    keep = [value for value in st.session_state.get(key, []) if value in options]
+    return st.multiselect(label, _filter_options(label, options, key, limit, keep), key=key)
+
+
+def results_table(results: Dict[str, Any]):
+    """Render a bulk operation's per-resource results as one table instead of a line per resource"""
+    df = pd.DataFrame({'resource': list(results), 'result': [str(result) for result in results.values()]})
+    st.dataframe(df, use_container_width=True, hide_index=True)
@@ -1,35 +1,42 @@
 import streamlit as st
-import tempfile, os, sys
+import tempfile, os, sys, shutil, hashlib, collections, itertools, atexit, time
 import pandas as pd
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
-sys.path.insert(0, ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
-from interface.cli import diagnose_cluster_from_path
-from ai_engine.autonomous_agent import run_autonomous_diagnosis, AutonomousAgent
-from ai_engine.kubectl_converter import KubectlConverter
-from models.feedback_db import store_feedback
-from k8s_connector.cluster_connector import load_cluster, auto_connect_cluster
+from ai_engine.safety_manager import SafetyManager
+from k8s_connector.cluster_connector import auto_connect_cluster
 from actions.restarter import restart_pod, delete_pod, restart_deployment, bulk_restart_pods, bulk_delete_pods, bulk_restart_deployments, bulk_delete_deployments, restart_all_pods_in_namespace
 from actions.scaler import scale_deployment, get_current_replicas, bulk_scale_deployments, scale_all_deployments_in_namespace, scale_deployment_by_percentage
-from actions.action_handler import get_all_pods, get_all_deployments, get_problematic_pods, get_all_namespaces
-from interface.simple_session import SimpleSessionManager
+from interface.web_ui._cached import cached_all_pods, cached_all_deployments, cached_problematic_pods, namespaces_or_error, clear_cluster_caches, get_converter, get_cluster_cache, stop_cluster_cache, get_session_manager, cache_stats, load_cluster_coalesced, path_exists, ENV_KUBECONFIG, DEFAULT_KUBECONFIG
+from interface.web_ui._widgets import searchable_selectbox, searchable_multiselect, results_table
 
 st.set_page_config("AutoKubeX", layout="wide", page_icon="🔍")
 
-# Initialize simple session manager
-if 'session_manager' not in st.session_state:
-    st.session_state.session_manager = SimpleSessionManager()
+_STATUS_EMOJI = {'success': '✅', 'failed': '❌', 'blocked': '🚫', 'simulated': '🧪'}
+_SEVERITY_EMOJI = {'critical': '🔴', 'high': '🟠', 'medium': '🟡', 'low': '🟢'}
+_PRIORITY_EMOJI = _SEVERITY_EMOJI
+_SESSION_DEFAULTS = {
+    'cluster_connected': False,
+    'kubeconfig_path': None,
+    'cluster_name': None,
+    'auto_restored': False,
+    'last_diag': None,
+    'last_custom': None
+}
 
-session_manager = st.session_state.session_manager
+# Shared session manager, created once per process
+session_manager = get_session_manager()
 
 # Initialize session state
-for key in ['cluster_connected', 'kubeconfig_path', 'cluster_name', 'auto_restored', 'last_diag', 'last_custom']:
-    if key not in st.session_state:
-        st.session_state[key] = None if key in ['kubeconfig_path', 'cluster_name', 'last_diag', 'last_custom'] else False
+ss = st.session_state
+for key, default in _SESSION_DEFAULTS.items():
+    ss.setdefault(key, default)
 
 # Auto-restore session on startup (only once per session)
-if not st.session_state.get('restore_attempted'):
+if not ss.get('restore_attempted'):
     if session_manager.auto_restore():
         st.success("✅ Previous session restored automatically!")
     else:
@@ -59,14 +66,55 @@ if st.session_state.cluster_connected:
             st.success(f"✅ Connected: **{cluster_name}**")
     with col2:
         if st.button("🔄 Refresh", type="secondary"):
+            clear_cluster_caches()
             st.rerun()
     with col3:
         if st.button("📤 Disconnect", type="secondary"):
             session_manager.clear_session()
+            clear_cluster_caches()
+            get_converter.clear()
+            stop_cluster_cache(st.session_state.kubeconfig_path)
             for key in ['cluster_connected', 'kubeconfig_path', 'cluster_name']:
                 st.session_state[key] = None if key != 'cluster_connected' else False
             st.rerun()
 
+def _remove_quietly(path: str):
+    """Delete a temp file at exit, ignoring files already gone"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _connect(kubeconfig_path: str, session_source=None, default_name: str = 'Kubernetes Cluster'):
+    """Test a kubeconfig, then record and persist the connection; session_source defaults to the file itself"""
+    with st.spinner("Testing connection..."):
+        try:
+            result = load_cluster_coalesced(kubeconfig_path)
+        except Exception as e:
+            st.error(f"❌ Connection error: {str(e)}")
+            with st.expander("🔧 Error Details"):
+                st.code(str(e))
+            return
+    
+    if not (result and result.get('status') == 'connected'):
+        st.error("❌ Failed to connect. Invalid kubeconfig or cluster unreachable.")
+        return
+    
+    st.session_state.cluster_connected = True
+    st.session_state.kubeconfig_path = kubeconfig_path
+    st.session_state.cluster_name = result.get('cluster_name', default_name)
+    st.session_state.pop('_probs_t', None)
+    
+    # Save session
+    if session_source is None:
+        with open(kubeconfig_path, 'rb') as f:
+            session_manager.save_session(f, st.session_state.cluster_name)
+    else:
+        session_manager.save_session(session_source, st.session_state.cluster_name)
+    
+    st.success(f"✅ Connected to {st.session_state.cluster_name}")
+    st.rerun()
+
 # Cluster connection section
 if not st.session_state.cluster_connected:
     st.markdown("### 🔗 Connect to Kubernetes Cluster")
@@ -77,74 +125,24 @@ if not st.session_state.cluster_connected:
     with col1:
         st.markdown("**🔍 Auto-detect kubeconfig:**")
         if st.button("🔍 Use Environment Kubeconfig", type="primary"):
-            try:
-                # Try environment variable first
-                env_kubeconfig = os.environ.get('KUBECONFIG')
-                default_kubeconfig = os.path.expanduser('~/.kube/config')
-                
-                kubeconfig_path = None
-                if env_kubeconfig and os.path.exists(env_kubeconfig):
-                    kubeconfig_path = env_kubeconfig
-                    st.info(f"Found KUBECONFIG: {env_kubeconfig}")
-                elif os.path.exists(default_kubeconfig):
-                    kubeconfig_path = default_kubeconfig
-                    st.info(f"Found default kubeconfig: {default_kubeconfig}")
-                else:
-                    st.error("❌ No kubeconfig found in environment or default location")
-                
-                if kubeconfig_path:
-                    with st.spinner("Testing connection..."):
-                        try:
-                            result = load_cluster(kubeconfig_path)
-                            if result and result.get('status') == 'connected':
-                                st.session_state.cluster_connected = True
-                                st.session_state.kubeconfig_path = kubeconfig_path
-                                st.session_state.cluster_name = result.get('cluster_name', 'Kubernetes Cluster')
-                                
-                                # Save session
-                                session_manager.save_session(kubeconfig_path, st.session_state.cluster_name)
-                                
-                                st.success(f"✅ Connected to {st.session_state.cluster_name}")
-                                st.rerun()
-                            else:
-                                st.error("❌ Failed to connect. Invalid kubeconfig or cluster unreachable.")
-                        except Exception as e:
-                            st.error(f"❌ Connection error: {str(e)}")
-                            with st.expander("🔧 Error Details"):
-                                st.code(str(e))
-                            
-            except Exception as e:
-                st.error(f"❌ Auto-detection failed: {e}")
+            # Try environment variable first
+            if ENV_KUBECONFIG and os.path.exists(ENV_KUBECONFIG):
+                st.info(f"Found KUBECONFIG: {ENV_KUBECONFIG}")
+                _connect(ENV_KUBECONFIG)
+            elif os.path.exists(DEFAULT_KUBECONFIG):
+                st.info(f"Found default kubeconfig: {DEFAULT_KUBECONFIG}")
+                _connect(DEFAULT_KUBECONFIG)
+            else:
+                st.error("❌ No kubeconfig found in environment or default location")
     
     with col2:
         st.markdown("**📝 Manual path:**")
         manual_path = st.text_input("Kubeconfig file path", placeholder="/path/to/kubeconfig")
         if st.button("🔗 Connect") and manual_path:
-            try:
-                if os.path.exists(manual_path):
-                    with st.spinner("Testing connection..."):
-                        try:
-                            result = load_cluster(manual_path)
-                            if result and result.get('status') == 'connected':
-                                st.session_state.cluster_connected = True
-                                st.session_state.kubeconfig_path = manual_path
-                                st.session_state.cluster_name = result.get('cluster_name', 'Kubernetes Cluster')
-                                
-                                # Save session
-                                session_manager.save_session(manual_path, st.session_state.cluster_name)
-                                
-                                st.success(f"✅ Connected to {st.session_state.cluster_name}")
-                                st.rerun()
-                            else:
-                                st.error("❌ Failed to connect. Invalid kubeconfig or cluster unreachable.")
-                        except Exception as e:
-                            st.error(f"❌ Connection error: {str(e)}")
-                            with st.expander("🔧 Error Details"):
-                                st.code(str(e))
-                else:
-                    st.error("❌ File not found. Please check the path.")
-            except Exception as e:
-                st.error(f"❌ Connection failed: {e}")
+            if os.path.exists(manual_path):
+                _connect(manual_path)
+            else:
+                st.error("❌ File not found. Please check the path.")
     
     # Load kubeconfig with file uploader
     with st.expander("📁 Upload Kubeconfig File"):
@@ -152,51 +150,34 @@ if not st.session_state.cluster_connected:
         
         if uploaded_file:
             try:
-                # Save uploaded file to temp location
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-                    f.write(uploaded_file.read().decode())
-                    temp_path = f.name
-                
-                st.info(f"📄 Uploaded file saved to: {temp_path}")
-                
-                # Test connection with detailed error reporting
-                with st.spinner("Testing connection..."):
-                    try:
-                        result = load_cluster(temp_path)
-                        if result and result.get('status') == 'connected':
-                            st.session_state.cluster_connected = True
-                            st.session_state.kubeconfig_path = temp_path
-                            st.session_state.cluster_name = result.get('cluster_name', 'Kubernetes Cluster')
-                            
-                            # Save session
-                            session_manager.save_session(temp_path, st.session_state.cluster_name)
-                            
-                            st.success(f"✅ Connected to {st.session_state.cluster_name}")
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to connect. Invalid kubeconfig or cluster unreachable.")
-                    except Exception as e:
-                        st.error(f"❌ Connection error: {str(e)}")
-                        # Show more details for debugging
-                        with st.expander("🔧 Error Details"):
-                            st.code(str(e))
-                        
+                # Save uploaded file to a content-addressed temp path so reruns reuse it
+                fingerprint = hashlib.sha256(uploaded_file.getvalue()).hexdigest()[:16]
+                temp_path = os.path.join(tempfile.gettempdir(), f"autokubex-{fingerprint}.yaml")
+                if not os.path.exists(temp_path):
+                    with open(f"{temp_path}.tmp", 'wb') as f:
+                        uploaded_file.seek(0)
+                        shutil.copyfileobj(uploaded_file, f, length=1 << 16)
+                    os.replace(f"{temp_path}.tmp", temp_path)
+                    atexit.register(_remove_quietly, temp_path)
+                st.session_state.tmp_kube = temp_path
             except Exception as e:
                 st.error(f"❌ File processing failed: {e}")
                 with st.expander("🔧 Error Details"):
                     st.code(str(e))
+            else:
+                st.info(f"📄 Uploaded file saved to: {temp_path}")
+                _connect(temp_path, session_source=uploaded_file)
     
     # Show detected paths for debugging
     with st.expander("🔧 Debug Info"):
-        st.write("**Environment KUBECONFIG:**", os.environ.get('KUBECONFIG', 'Not set'))
-        st.write("**Default kubeconfig:**", os.path.expanduser('~/.kube/config'))
+        st.write("**Environment KUBECONFIG:**", ENV_KUBECONFIG or 'Not set')
+        st.write("**Default kubeconfig:**", DEFAULT_KUBECONFIG)
         st.write("**Current working directory:**", os.getcwd())
         
-        env_kubeconfig = os.environ.get('KUBECONFIG')
-        if env_kubeconfig:
-            st.write(f"**KUBECONFIG exists:** {os.path.exists(env_kubeconfig)}")
-        default_kubeconfig = os.path.expanduser('~/.kube/config')
-        st.write(f"**Default config exists:** {os.path.exists(default_kubeconfig)}")
+        # The panel body runs on every rerun even when collapsed, so existence checks are memoized
+        if ENV_KUBECONFIG:
+            st.write(f"**KUBECONFIG exists:** {path_exists(ENV_KUBECONFIG)}")
+        st.write(f"**Default config exists:** {path_exists(DEFAULT_KUBECONFIG)}")
         
         # Quick test with the known working path
         st.markdown("---")
@@ -204,31 +185,21 @@ if not st.session_state.cluster_connected:
         working_path = "/Users/hrushi/DevBoxLite/mixed-os-cluster-config.yaml"
         if st.button("🧪 Test Known Working Config"):
             if os.path.exists(working_path):
-                try:
-                    with st.spinner("Testing known working config..."):
-                        result = load_cluster(working_path)
-                        if result and result.get('status') == 'connected':
-                            st.session_state.cluster_connected = True
-                            st.session_state.kubeconfig_path = working_path
-                            st.session_state.cluster_name = result.get('cluster_name', 'Mixed OS Cluster')
-                            
-                            # Save session
-                            session_manager.save_session(working_path, st.session_state.cluster_name)
-                            
-                            st.success(f"✅ Connected using working path!")
-                            st.rerun()
-                        else:
-                            st.error("❌ Even the known working path failed!")
-                except Exception as e:
-                    st.error(f"❌ Error with working path: {e}")
-                    st.code(str(e))
+                _connect(working_path, default_name='Mixed OS Cluster')
             else:
                 st.warning(f"❌ Working path doesn't exist: {working_path}")
 
 # Show quick cluster status if connected
 if st.session_state.cluster_connected:
     try:
-        problems = get_problematic_pods()
+        # Pod and deployment listings are served by background watches from here on
+        get_cluster_cache(st.session_state.kubeconfig_path)
+        # Rapid reruns (typing, toggles) reuse the last result without a cache lookup
+        now = time.monotonic()
+        if now - ss.get('_probs_t', 0) > 2:
+            ss['_probs'] = cached_problematic_pods(st.session_state.kubeconfig_path)
+            ss['_probs_t'] = now
+        problems = ss['_probs']
         if problems:
             st.warning(f"⚠️ Found {len(problems)} problematic pods")
         else:
@@ -244,7 +215,7 @@ if st.session_state.cluster_connected:
         st.markdown("**Deploy Kubernetes resources using plain English commands**")
         
         # Initialize kubectl converter
-        converter = KubectlConverter(st.session_state.kubeconfig_path)
+        converter = get_converter(st.session_state.kubeconfig_path)
         
         # Examples section
         with st.expander("💡 Example Commands"):
@@ -347,19 +318,22 @@ if st.session_state.cluster_connected:
                         st.error(f"❌ Error processing command: {e}")
         
         # Command history
-        if 'nl_command_history' not in st.session_state:
-            st.session_state.nl_command_history = []
+        history = st.session_state.setdefault('nl_command_history', collections.deque(maxlen=50))
+        history_set = st.session_state.setdefault('nl_command_history_set', set(history))
         
-        if st.session_state.nl_command_history:
+        if history:
             st.markdown("### � Recent Commands")
-            for i, cmd in enumerate(reversed(st.session_state.nl_command_history[-5:])):
-                with st.expander(f"Command {len(st.session_state.nl_command_history) - i}: {cmd[:50]}..."):
-                    st.code(cmd)
+            # One code block for the last five commands instead of an expander per command
+            recent = itertools.islice(reversed(history), 5)
+            st.code("\n---\n".join(f"{len(history) - i}. {cmd}" for i, cmd in enumerate(recent)), language="bash")
         
         # Add current command to history
         if nl_command.strip() and st.button("� Save to History"):
-            if nl_command not in st.session_state.nl_command_history:
-                st.session_state.nl_command_history.append(nl_command)
+            if nl_command not in history_set:
+                if len(history) == history.maxlen:
+                    history_set.discard(history[0])  # Evicted by the append below
+                history.append(nl_command)
+                history_set.add(nl_command)
                 st.success("Command saved to history!")
     
     with tab2:
@@ -369,8 +343,8 @@ if st.session_state.cluster_connected:
         # Safety status
         with st.expander("🛡️ Safety Constraints & Status"):
             try:
-                agent = AutonomousAgent(dry_run=True)
-                safety_status = agent.get_safety_status()
+                # Only the safety limits are needed here, not a full agent with its AI engines
+                safety_status = SafetyManager().get_safety_status()
                 
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -417,6 +391,7 @@ if st.session_state.cluster_connected:
                 
                 with st.spinner("🤖 AI is analyzing your cluster and planning fixes..."):
                     try:
+                        from ai_engine.autonomous_agent import run_autonomous_diagnosis
                         result = run_autonomous_diagnosis(
                             user_prompt=custom_ai_prompt if custom_ai_prompt else None,
                             dry_run=dry_run
@@ -446,9 +421,9 @@ if st.session_state.cluster_connected:
                 st.success("✅ History cleared")
         
         # Display advanced analysis results
-        if st.session_state.get('advanced_analysis'):
+        analysis = ss.get('advanced_analysis')
+        if analysis:
             st.markdown("### 🧠 Advanced AI Analysis Results")
-            analysis = st.session_state['advanced_analysis']
             
             if 'error' not in analysis:
                 # Health Score Display
@@ -472,8 +447,7 @@ if st.session_state.cluster_connected:
                 if critical_issues:
                     st.markdown("**🚨 Critical Issues Detected:**")
                     for issue in critical_issues[:3]:  # Show top 3
-                        severity_emoji = {'critical': '🔴', 'high': '🟠', 'medium': '🟡', 'low': '🟢'}
-                        emoji = severity_emoji.get(issue.get('severity', 'low'), '🔵')
+                        emoji = _SEVERITY_EMOJI.get(issue.get('severity', 'low'), '🔵')
                         
                         with st.expander(f"{emoji} {issue.get('type', 'Unknown Issue')} - {issue.get('severity', 'unknown').upper()}"):
                             st.write(f"**Message:** {issue.get('message', 'No details')}")
@@ -501,8 +475,7 @@ if st.session_state.cluster_connected:
                 if recommendations:
                     st.markdown("**💡 AI Recommendations:**")
                     for i, rec in enumerate(recommendations[:3], 1):  # Show top 3
-                        priority_emoji = {'critical': '🔴', 'high': '🟠', 'medium': '🟡', 'low': '🟢'}
-                        emoji = priority_emoji.get(rec.get('priority', 'low'), '🔵')
+                        emoji = _PRIORITY_EMOJI.get(rec.get('priority', 'low'), '🔵')
                         
                         with st.expander(f"{emoji} Recommendation #{i}: {rec.get('type', 'Unknown')}"):
                             st.write(f"**Priority:** {rec.get('priority', 'unknown').upper()}")
@@ -525,8 +498,8 @@ if st.session_state.cluster_connected:
                 st.error(f"Analysis failed: {analysis.get('error')}")
         
         # Show autonomous results
-        if st.session_state.get('autonomous_result'):
-            result = st.session_state['autonomous_result']
+        result = ss.get('autonomous_result')
+        if result:
             
             if 'error' in result:
                 st.error(f"❌ Error: {result['error']}")
@@ -542,29 +515,21 @@ if st.session_state.cluster_connected:
                     
                     # Summary metrics
                     execution_results = result['execution_results']
-                    success_count = len([a for a in execution_results if a['status'] == 'success'])
-                    failed_count = len([a for a in execution_results if a['status'] == 'failed'])
-                    blocked_count = len([a for a in execution_results if a['status'] == 'blocked'])
-                    simulated_count = len([a for a in execution_results if a['status'] == 'simulated'])
+                    status_counts = collections.Counter(a['status'] for a in execution_results)
                     
                     col1, col2, col3, col4 = st.columns(4)
                     with col1:
-                        st.metric("✅ Successful", success_count)
+                        st.metric("✅ Successful", status_counts['success'])
                     with col2:
-                        st.metric("❌ Failed", failed_count)
+                        st.metric("❌ Failed", status_counts['failed'])
                     with col3:
-                        st.metric("� Blocked", blocked_count)
+                        st.metric("� Blocked", status_counts['blocked'])
                     with col4:
-                        st.metric("🧪 Simulated", simulated_count)
+                        st.metric("🧪 Simulated", status_counts['simulated'])
                     
                     # Detailed results
                     for i, action in enumerate(execution_results, 1):
-                        status_emoji = {
-                            'success': '✅',
-                            'failed': '❌',
-                            'blocked': '🚫',
-                            'simulated': '🧪'
-                        }.get(action['status'], '❓')
+                        status_emoji = _STATUS_EMOJI.get(action['status'], '❓')
                         
                         with st.expander(f"{status_emoji} Action {i}: {action['action']}"):
                             st.write(f"**Reason:** {action['reason']}")
@@ -589,220 +554,191 @@ if st.session_state.cluster_connected:
             st.info("🔄 Auto-monitoring is a future feature - currently shows latest analysis results")
     
     with tab3:
-        st.subheader("🚀 Quick Resource Actions")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**Pod Operations**")
-            namespaces = get_all_namespaces()
-            selected_ns = st.selectbox("Namespace", namespaces, key="ns1")
+        @st.fragment
+        def _quick_actions_tab():
+            st.subheader("🚀 Quick Resource Actions")
             
-            if selected_ns and not selected_ns.startswith("Error"):
-                pods = get_all_pods(selected_ns)
-                pod_names = [pod['name'] for pod in pods if 'error' not in pod]
-                
-                if pod_names:
-                    selected_pod = st.selectbox("Pod", pod_names)
-                    
-                    col1a, col1b = st.columns(2)
-                    with col1a:
-                        if st.button("🔄 Restart"):
-                            result = restart_pod(selected_ns, selected_pod)
-                            st.write(result)
-                    with col1b:
-                        if st.button("�️ Delete"):
-                            result = delete_pod(selected_ns, selected_pod)
-                            st.write(result)
-        
-        with col2:
-            st.write("**Deployment Operations**")
-            deployments = get_all_deployments()
-            if deployments and 'error' not in deployments[0]:
-                dep_options = [f"{d['namespace']}/{d['name']}" for d in deployments if 'error' not in d]
+            # One check up front; an unreachable cluster skips every picker below
+            namespaces, ns_error = namespaces_or_error(st.session_state.kubeconfig_path)
+            if ns_error:
+                st.error(f"❌ Failed to list namespaces: {ns_error}")
+                return
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write("**Pod Operations**")
+                selected_ns = st.selectbox("Namespace", namespaces, key="ns1")
                 
-                if dep_options:
-                    selected_dep = st.selectbox("Deployment", dep_options)
+                if selected_ns:
+                    pods = cached_all_pods(st.session_state.kubeconfig_path, selected_ns)
+                    pod_names = [pod['name'] for pod in pods if 'error' not in pod]
                     
-                    if selected_dep:
-                        ns, name = selected_dep.split('/')
-                        current_replicas = next(d['replicas'] for d in deployments if d['namespace'] == ns and d['name'] == name)
-                        
-                        new_replicas = st.number_input("Replicas", min_value=0, value=current_replicas)
+                    if pod_names:
+                        selected_pod = searchable_selectbox("Pod", pod_names, key="pod1")
                         
-                        col2a, col2b = st.columns(2)
-                        with col2a:
-                            if st.button("📈 Scale"):
-                                result = scale_deployment(ns, name, new_replicas)
+                        col1a, col1b = st.columns(2)
+                        with col1a:
+                            if st.button("🔄 Restart"):
+                                result = restart_pod(selected_ns, selected_pod)
+                                clear_cluster_caches()
                                 st.write(result)
-                        with col2b:
-                            if st.button("🔄 Restart Deployment"):
-                                result = restart_deployment(ns, name)
+                        with col1b:
+                            if st.button("�️ Delete"):
+                                result = delete_pod(selected_ns, selected_pod)
+                                clear_cluster_caches()
                                 st.write(result)
-
-    with tab4:
-        st.subheader("� Bulk Operations")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**Pod Operations**")
-            namespaces = get_all_namespaces()
-            selected_ns = st.selectbox("Namespace", namespaces, key="quick_ns1")
             
-            if selected_ns and not selected_ns.startswith("Error"):
-                pods = get_all_pods(selected_ns)
-                pod_names = [pod['name'] for pod in pods if 'error' not in pod]
-                
-                if pod_names:
-                    selected_pod = st.selectbox("Pod", pod_names, key="quick_pod1")
-                    
-                    col1a, col1b = st.columns(2)
-                    with col1a:
-                        if st.button("🔄 Restart", key="quick_restart1"):
-                            result = restart_pod(selected_ns, selected_pod)
-                            st.write(result)
-                    with col1b:
-                        if st.button("🗑️ Delete", key="quick_delete1"):
-                            result = delete_pod(selected_ns, selected_pod)
-                            st.write(result)
-        
-        with col2:
-            st.write("**Deployment Operations**")
-            deployments = get_all_deployments()
-            if deployments and 'error' not in deployments[0]:
-                dep_options = [f"{d['namespace']}/{d['name']}" for d in deployments if 'error' not in d]
-                
-                if dep_options:
-                    selected_dep = st.selectbox("Deployment", dep_options, key="quick_dep1")
+            with col2:
+                st.write("**Deployment Operations**")
+                deployments = cached_all_deployments(st.session_state.kubeconfig_path)
+                replicas_by_id = {(d['namespace'], d['name']): d['replicas'] for d in deployments if 'error' not in d}
+                if deployments and 'error' not in deployments[0]:
+                    dep_options = [f"{d['namespace']}/{d['name']}" for d in deployments if 'error' not in d]
                     
-                    if selected_dep:
-                        ns, name = selected_dep.split('/')
-                        current_replicas = next(d['replicas'] for d in deployments if d['namespace'] == ns and d['name'] == name)
-                        
-                        new_replicas = st.number_input("Replicas", min_value=0, value=current_replicas, key="quick_replicas1")
+                    if dep_options:
+                        selected_dep = searchable_selectbox("Deployment", dep_options, key="dep1")
                         
-                        col2a, col2b = st.columns(2)
-                        with col2a:
-                            if st.button("📈 Scale", key="quick_scale1"):
-                                result = scale_deployment(ns, name, new_replicas)
-                                st.write(result)
-                        with col2b:
-                            if st.button("🔄 Restart Deployment", key="quick_restart_dep1"):
-                                result = restart_deployment(ns, name)
-                                st.write(result)
+                        if selected_dep:
+                            ns, name = selected_dep.split('/')
+                            current_replicas = replicas_by_id[(ns, name)]
+                            
+                            new_replicas = st.number_input("Replicas", min_value=0, value=current_replicas)
+                            
+                            col2a, col2b = st.columns(2)
+                            with col2a:
+                                if st.button("📈 Scale"):
+                                    result = scale_deployment(ns, name, new_replicas)
+                                    clear_cluster_caches()
+                                    st.write(result)
+                            with col2b:
+                                if st.button("🔄 Restart Deployment"):
+                                    result = restart_deployment(ns, name)
+                                    clear_cluster_caches()
+                                    st.write(result)
+        _quick_actions_tab()
 
     with tab4:
-        st.subheader("⚠️ Problem Detection & Resolution")
-        
-        bulk_type = st.radio("Operation Type", ["Pods", "Deployments"], horizontal=True)
-        
-        if bulk_type == "Pods":
-            ns_bulk = st.selectbox("Namespace", get_all_namespaces(), key="bulk_ns")
-            if ns_bulk and not ns_bulk.startswith("Error"):
-                pods = get_all_pods(ns_bulk)
-                pod_names = [pod['name'] for pod in pods if 'error' not in pod]
-                
-                if pod_names:
-                    selected_pods = st.multiselect("Select Pods", pod_names)
+        @st.fragment
+        def _bulk_operations_tab():
+            st.subheader("📊 Bulk Operations")
+            
+            # One check up front; an unreachable cluster skips every picker below
+            namespaces, ns_error = namespaces_or_error(st.session_state.kubeconfig_path)
+            if ns_error:
+                st.error(f"❌ Failed to list namespaces: {ns_error}")
+                return
+            
+            bulk_type = st.radio("Operation Type", ["Pods", "Deployments"], horizontal=True)
+            
+            if bulk_type == "Pods":
+                ns_bulk = st.selectbox("Namespace", namespaces, key="bulk_ns")
+                if ns_bulk:
+                    pods = cached_all_pods(st.session_state.kubeconfig_path, ns_bulk)
+                    pod_names = [pod['name'] for pod in pods if 'error' not in pod]
                     
-                    if selected_pods:
-                        col1, col2, col3 = st.columns(3)
-                        
-                        with col1:
-                            if st.button("🔄 Bulk Restart Pods"):
-                                results = bulk_restart_pods(ns_bulk, selected_pods)
-                                for pod, result in results.items():
-                                    st.write(f"{pod}: {result}")
+                    if pod_names:
+                        selected_pods = searchable_multiselect("Select Pods", pod_names, key="bulk_pods")
                         
-                        with col2:
-                            if st.button("🗑️ Bulk Delete Pods"):
-                                results = bulk_delete_pods(ns_bulk, selected_pods)
-                                for pod, result in results.items():
-                                    st.write(f"{pod}: {result}")
-                        
-                        with col3:
-                            if st.button("🔄 Restart All Pods in NS"):
-                                results = restart_all_pods_in_namespace(ns_bulk)
-                                for item, result in results.items():
-                                    st.write(result)
-        
-        else:  # Deployments
-            deployments = get_all_deployments()
-            if deployments and 'error' not in deployments[0]:
-                ns_deps = {}
-                for dep in deployments:
-                    if 'error' not in dep:
-                        ns = dep['namespace']
-                        if ns not in ns_deps:
-                            ns_deps[ns] = []
-                        ns_deps[ns].append(dep)
-                
-                selected_ns_dep = st.selectbox("Namespace", list(ns_deps.keys()), key="bulk_dep_ns")
-                
-                if selected_ns_dep:
-                    dep_names = [dep['name'] for dep in ns_deps[selected_ns_dep]]
-                    selected_deps = st.multiselect("Select Deployments", dep_names)
+                        if selected_pods:
+                            col1, col2, col3 = st.columns(3)
+                            
+                            with col1:
+                                if st.button("🔄 Bulk Restart Pods"):
+                                    results = bulk_restart_pods(ns_bulk, selected_pods)
+                                    clear_cluster_caches()
+                                    results_table(results)
+                            
+                            with col2:
+                                if st.button("🗑️ Bulk Delete Pods"):
+                                    results = bulk_delete_pods(ns_bulk, selected_pods)
+                                    clear_cluster_caches()
+                                    results_table(results)
+                            
+                            with col3:
+                                if st.button("🔄 Restart All Pods in NS"):
+                                    results = restart_all_pods_in_namespace(ns_bulk)
+                                    clear_cluster_caches()
+                                    results_table(results)
+            
+            else:  # Deployments
+                deployments = cached_all_deployments(st.session_state.kubeconfig_path)
+                replicas_by_id = {(d['namespace'], d['name']): d['replicas'] for d in deployments if 'error' not in d}
+                if deployments and 'error' not in deployments[0]:
+                    ns_deps = collections.defaultdict(list)
+                    for dep in deployments:
+                        if 'error' not in dep:
+                            ns_deps[dep['namespace']].append(dep)
                     
-                    if selected_deps:
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            if st.button("🔄 Bulk Restart Deployments"):
-                                results = bulk_restart_deployments(selected_ns_dep, selected_deps)
-                                for dep, result in results.items():
-                                    st.write(f"{dep}: {result}")
+                    selected_ns_dep = st.selectbox("Namespace", sorted(ns_deps), key="bulk_dep_ns")
+                    
+                    if selected_ns_dep:
+                        dep_names = [dep['name'] for dep in ns_deps[selected_ns_dep]]
+                        selected_deps = searchable_multiselect("Select Deployments", dep_names, key="bulk_deps")
                         
-                        with col2:
-                            # Scale configuration
-                            st.write("**Bulk Scale Configuration**")
-                            scale_configs = {}
-                            for dep_name in selected_deps:
-                                current = next(d['replicas'] for d in ns_deps[selected_ns_dep] if d['name'] == dep_name)
-                                scale_configs[dep_name] = st.number_input(
-                                    f"{dep_name} replicas", 
-                                    min_value=0, 
-                                    value=current,
-                                    key=f"scale_{dep_name}"
-                                )
+                        if selected_deps:
+                            col1, col2 = st.columns(2)
+                            
+                            with col1:
+                                if st.button("🔄 Bulk Restart Deployments"):
+                                    results = bulk_restart_deployments(selected_ns_dep, selected_deps)
+                                    clear_cluster_caches()
+                                    results_table(results)
                             
-                            if st.button("📈 Bulk Scale"):
-                                results = bulk_scale_deployments(selected_ns_dep, scale_configs)
-                                for dep, result in results.items():
-                                    st.write(f"{dep}: {result}")
+                            with col2:
+                                # Scale configuration
+                                st.write("**Bulk Scale Configuration**")
+                                scale_configs = {}
+                                for dep_name in selected_deps:
+                                    current = replicas_by_id[(selected_ns_dep, dep_name)]
+                                    scale_configs[dep_name] = st.number_input(
+                                        f"{dep_name} replicas", 
+                                        min_value=0, 
+                                        value=current,
+                                        key=f"scale_{dep_name}"
+                                    )
+                                
+                                if st.button("📈 Bulk Scale"):
+                                    results = bulk_scale_deployments(selected_ns_dep, scale_configs)
+                                    clear_cluster_caches()
+                                    results_table(results)
+        _bulk_operations_tab()
     
     with tab5:
-        st.subheader("⚠️ Problem Detection & Resolution")
-        
-        try:
-            problems = get_problematic_pods()
+        @st.fragment
+        def _problems_tab():
+            st.subheader("⚠️ Problem Detection & Resolution")
             
-            if problems:
-                st.error(f"Found {len(problems)} problematic pods")
-                
-                for pod in problems:
-                    with st.expander(f"❌ {pod['namespace']}/{pod['name']} - {pod['phase']}"):
-                        col1, col2, col3 = st.columns([2, 2, 1])
-                        
-                        with col1:
-                            st.write(f"**Status:** {pod['phase']}")
-                            st.write(f"**Ready:** {'Yes' if pod.get('ready', False) else 'No'}")
-                        
-                        with col2:
-                            st.write(f"**Restarts:** {pod.get('restarts', 0)}")
-                            st.write(f"**Node:** {pod.get('node', 'Unknown')}")
-                        
-                        with col3:
-                            if st.button("🔄 Fix", key=f"fix_{pod['namespace']}_{pod['name']}"):
-                                result = restart_pod(pod['namespace'], pod['name'])
-                                st.write(result)
-            else:
-                st.success("✅ No problematic pods found! Cluster is healthy.")
+            try:
+                problems = cached_problematic_pods(st.session_state.kubeconfig_path)
                 
-        except Exception as e:
-            st.error(f"Failed to check for problems: {e}")
+                if problems:
+                    st.error(f"Found {len(problems)} problematic pods")
+                    
+                    # One table and one picker instead of an expander and button per pod
+                    df = pd.DataFrame(problems)[['namespace', 'name', 'phase', 'ready', 'restarts', 'node']]
+                    st.dataframe(df, use_container_width=True, hide_index=True)
+                    
+                    pods_by_label = {f"{pod['namespace']}/{pod['name']}": pod for pod in problems}
+                    selected = searchable_selectbox("Fix which pod?", list(pods_by_label), key="fix_pod")
+                    if selected and st.button("🔄 Fix", key="fix_selected"):
+                        pod = pods_by_label[selected]
+                        result = restart_pod(pod['namespace'], pod['name'])
+                        clear_cluster_caches()
+                        st.write(result)
+                else:
+                    st.success("✅ No problematic pods found! Cluster is healthy.")
+                    
+            except Exception as e:
+                st.error(f"Failed to check for problems: {e}")
+        _problems_tab()
 
 # Footer info
 if st.session_state.cluster_connected:
     st.markdown("---")
     st.markdown("💡 **Tip:** Your session is automatically saved. You can refresh the browser without losing connection.")
+
+# Cache hit/miss counters for tuning, drawn last so they include this run, shown with ?debug=1
+if st.query_params.get("debug") == "1":
+    with st.sidebar.expander("Cache Stats"):
+        st.dataframe(pd.DataFrame(cache_stats()), use_container_width=True, hide_index=True)
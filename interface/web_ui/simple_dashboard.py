@@ -1,25 +1,45 @@
 import streamlit as st
-import tempfile, os, sys
+import os, sys, hashlib, functools, collections
+import yaml
 import pandas as pd
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
-sys.path.insert(0, ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
-from interface.cli import diagnose_cluster_from_path
-from models.feedback_db import store_feedback
 from k8s_connector.cluster_connector import load_cluster
 from actions.restarter import restart_pod, delete_pod, restart_deployment, bulk_restart_pods, bulk_delete_pods, bulk_restart_deployments, bulk_delete_deployments, restart_all_pods_in_namespace
 from actions.scaler import scale_deployment, get_current_replicas, bulk_scale_deployments, scale_all_deployments_in_namespace, scale_deployment_by_percentage
-from actions.action_handler import get_all_pods, get_all_deployments, get_problematic_pods, get_all_namespaces
-from interface.simple_session import SimpleSessionManager
+from interface.web_ui._cached import cached_all_pods, cached_all_deployments, namespaces_or_error, cached_problematic_pods, clear_cluster_caches, get_cluster_cache, stop_cluster_cache, get_session_manager, cache_stats
+from interface.web_ui._widgets import searchable_selectbox, searchable_multiselect, results_table
 
 st.set_page_config("AutoKubeX", layout="wide", page_icon="🔍")
 
-# Initialize simple session manager
-if 'session_manager' not in st.session_state:
-    st.session_state.session_manager = SimpleSessionManager()
+@functools.cache
+def _diag():
+    """Import the CLI diagnosis entry point on first use rather than on every page load"""
+    from interface.cli import diagnose_cluster_from_path
+    return diagnose_cluster_from_path
 
-session_manager = st.session_state.session_manager
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_diagnose(kube_hash: str, _kube_path: str, prompt: str = None):
+    """Run a diagnosis once per kubeconfig content and prompt (the leading underscore keeps the path out of the cache key)"""
+    return _diag()(_kube_path, custom_prompt=prompt)
+
+def _clear_caches():
+    """Drop cached listings and diagnoses so the next render reflects the live cluster"""
+    clear_cluster_caches()
+    _cached_diagnose.clear()
+
+def _kube_hash() -> str:
+    """SHA-256 of the connected kubeconfig, computed once per session"""
+    if not st.session_state.get('kube_hash'):
+        with open(st.session_state.kubeconfig_path, 'rb') as f:
+            st.session_state.kube_hash = hashlib.sha256(f.read()).hexdigest()
+    return st.session_state.kube_hash
+
+# Shared session manager, created once per process
+session_manager = get_session_manager()
 
 # Initialize session state
 for key in ['cluster_connected', 'kubeconfig_path', 'cluster_name', 'auto_restored', 'last_diag', 'last_custom']:
@@ -46,12 +66,16 @@ if st.session_state.cluster_connected:
             st.success(f"✅ Connected: **{cluster_name}**")
     with col2:
         if st.button("🔄 Refresh", type="secondary"):
+            _clear_caches()
             st.rerun()
     with col3:
         if st.button("🔴 Disconnect", type="secondary"):
             session_manager.clear_session()
+            _clear_caches()
+            stop_cluster_cache(st.session_state.kubeconfig_path)
             for key in ['cluster_connected', 'kubeconfig_path', 'cluster_name', 'auto_restored', 'last_diag', 'last_custom']:
                 st.session_state[key] = None if key in ['kubeconfig_path', 'cluster_name', 'last_diag', 'last_custom'] else False
+            st.session_state.kube_hash = None
             st.rerun()
 else:
     # Upload section - simple and clean
@@ -61,38 +85,35 @@ else:
     cluster_name = st.text_input("Cluster Name (optional)", placeholder="My Kubernetes Cluster")
     
     if uploaded and st.button("🔗 Connect", type="primary"):
-        try:
-            # Test connection first
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".yaml") as temp_file:
-                temp_file.write(uploaded.read())
-                temp_path = temp_file.name
-            
-            with st.spinner("Testing connection..."):
-                load_cluster(temp_path)
-                st.success("✅ Connection successful!")
-            
-            # Save session
-            uploaded.seek(0)  # Reset file pointer
-            if session_manager.save_session(uploaded.read(), cluster_name):
-                st.session_state.cluster_connected = True
-                st.session_state.kubeconfig_path = session_manager.kubeconfig_file
-                st.session_state.cluster_name = cluster_name or "Kubernetes Cluster"
-                st.session_state.auto_restored = False
-                st.rerun()
-            
-            os.unlink(temp_path)  # Cleanup temp file
-            
-        except Exception as e:
-            st.error(f"❌ Connection failed: {e}")
-            if 'temp_path' in locals():
-                os.unlink(temp_path)
+        # Read the upload once; the session file doubles as the kubeconfig we connect with
+        data = uploaded.getvalue()
+        connected = False
+        if session_manager.save_session(data, cluster_name):
+            try:
+                with st.spinner("Testing connection..."):
+                    load_cluster(session_manager.kubeconfig_file, config_dict=yaml.safe_load(data))
+                    st.success("✅ Connection successful!")
+                connected = True
+            except Exception as e:
+                session_manager.clear_session()
+                st.error(f"❌ Connection failed: {e}")
+        
+        if connected:
+            st.session_state.kube_hash = hashlib.sha256(data).hexdigest()
+            st.session_state.cluster_connected = True
+            st.session_state.kubeconfig_path = session_manager.kubeconfig_file
+            st.session_state.cluster_name = cluster_name or "Kubernetes Cluster"
+            st.session_state.auto_restored = False
+            st.rerun()
 
 # Main interface - only show if connected
 if st.session_state.cluster_connected:
     
     # Quick status bar
     try:
-        problems = get_problematic_pods()
+        # Pod and deployment listings are served by background watches from here on
+        get_cluster_cache(st.session_state.kubeconfig_path)
+        problems = cached_problematic_pods(st.session_state.kubeconfig_path)
         if problems:
             st.warning(f"⚠️ {len(problems)} problematic pods detected")
         else:
@@ -112,7 +133,7 @@ if st.session_state.cluster_connected:
             if st.button("🔍 Run Full Diagnosis", type="primary"):
                 with st.spinner("Analyzing cluster..."):
                     try:
-                        st.session_state.last_diag = diagnose_cluster_from_path(st.session_state.kubeconfig_path)
+                        st.session_state.last_diag = _cached_diagnose(_kube_hash(), st.session_state.kubeconfig_path, None)
                     except Exception as e:
                         st.error(f"Analysis failed: {e}")
         
@@ -121,8 +142,8 @@ if st.session_state.cluster_connected:
             if st.button("🤔 Ask AI") and custom_prompt.strip():
                 with st.spinner("Thinking..."):
                     try:
-                        st.session_state.last_custom = diagnose_cluster_from_path(
-                            st.session_state.kubeconfig_path, custom_prompt=custom_prompt
+                        st.session_state.last_custom = _cached_diagnose(
+                            _kube_hash(), st.session_state.kubeconfig_path, custom_prompt
                         )
                     except Exception as e:
                         st.error(f"Query failed: {e}")
@@ -137,168 +158,191 @@ if st.session_state.cluster_connected:
             st.markdown(st.session_state.last_custom["ai_response"])
     
     with tab2:
-        st.subheader("Quick Resource Actions")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**Pod Operations**")
-            namespaces = get_all_namespaces()
-            selected_ns = st.selectbox("Namespace", namespaces, key="ns1")
+        @st.fragment
+        def _quick_actions_tab():
+            st.subheader("Quick Resource Actions")
             
-            if selected_ns and not selected_ns.startswith("Error"):
-                pods = get_all_pods(selected_ns)
-                pod_names = [pod['name'] for pod in pods if 'error' not in pod]
-                
-                if pod_names:
-                    selected_pod = st.selectbox("Pod", pod_names)
-                    
-                    col1a, col1b = st.columns(2)
-                    with col1a:
-                        if st.button("🔄 Restart"):
-                            result = restart_pod(selected_ns, selected_pod)
-                            st.write(result)
-                    with col1b:
-                        if st.button("🗑️ Delete"):
-                            result = delete_pod(selected_ns, selected_pod)
-                            st.write(result)
-        
-        with col2:
-            st.write("**Deployment Operations**")
-            deployments = get_all_deployments()
-            if deployments and 'error' not in deployments[0]:
-                dep_options = [f"{d['namespace']}/{d['name']}" for d in deployments if 'error' not in d]
+            # One check up front; an unreachable cluster skips every picker below
+            namespaces, ns_error = namespaces_or_error(st.session_state.kubeconfig_path)
+            if ns_error:
+                st.error(f"❌ Failed to list namespaces: {ns_error}")
+                return
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write("**Pod Operations**")
+                selected_ns = st.selectbox("Namespace", namespaces, key="ns1")
                 
-                if dep_options:
-                    selected_dep = st.selectbox("Deployment", dep_options)
+                if selected_ns:
+                    pods = cached_all_pods(st.session_state.kubeconfig_path, selected_ns)
+                    pod_names = [pod['name'] for pod in pods if 'error' not in pod]
                     
-                    if selected_dep:
-                        ns, name = selected_dep.split('/')
-                        current_replicas = next(d['replicas'] for d in deployments if d['namespace'] == ns and d['name'] == name)
+                    if pod_names:
+                        selected_pod = searchable_selectbox("Pod", pod_names, key="pod1")
                         
-                        new_replicas = st.number_input("Replicas", min_value=0, value=current_replicas)
-                        
-                        col2a, col2b = st.columns(2)
-                        with col2a:
-                            if st.button("📈 Scale"):
-                                result = scale_deployment(ns, name, new_replicas)
+                        col1a, col1b = st.columns(2)
+                        with col1a:
+                            if st.button("🔄 Restart"):
+                                result = restart_pod(selected_ns, selected_pod)
+                                _clear_caches()
                                 st.write(result)
-                        with col2b:
-                            if st.button("🔄 Restart Deployment"):
-                                result = restart_deployment(ns, name)
+                        with col1b:
+                            if st.button("🗑️ Delete"):
+                                result = delete_pod(selected_ns, selected_pod)
+                                _clear_caches()
                                 st.write(result)
-    
-    with tab3:
-        st.subheader("Bulk Operations")
-        
-        bulk_type = st.radio("Operation Type", ["Pods", "Deployments"], horizontal=True)
-        
-        if bulk_type == "Pods":
-            ns_bulk = st.selectbox("Namespace", get_all_namespaces(), key="bulk_ns")
-            if ns_bulk and not ns_bulk.startswith("Error"):
-                pods = get_all_pods(ns_bulk)
-                pod_names = [pod['name'] for pod in pods if 'error' not in pod]
-                
-                if pod_names:
-                    selected_pods = st.multiselect("Select Pods", pod_names)
+            
+            with col2:
+                st.write("**Deployment Operations**")
+                deployments = cached_all_deployments(st.session_state.kubeconfig_path)
+                replicas_by_id = {(d['namespace'], d['name']): d['replicas'] for d in deployments if 'error' not in d}
+                if deployments and 'error' not in deployments[0]:
+                    dep_options = [f"{d['namespace']}/{d['name']}" for d in deployments if 'error' not in d]
                     
-                    if selected_pods:
-                        col1, col2, col3 = st.columns(3)
+                    if dep_options:
+                        selected_dep = searchable_selectbox("Deployment", dep_options, key="dep1")
                         
-                        with col1:
-                            if st.button("🔄 Bulk Restart Pods"):
-                                results = bulk_restart_pods(ns_bulk, selected_pods)
-                                for pod, result in results.items():
-                                    st.write(f"{pod}: {result}")
-                        
-                        with col2:
-                            if st.button("🗑️ Bulk Delete Pods"):
-                                results = bulk_delete_pods(ns_bulk, selected_pods)
-                                for pod, result in results.items():
-                                    st.write(f"{pod}: {result}")
-                        
-                        with col3:
-                            if st.button("🔄 Restart All Pods in NS"):
-                                results = restart_all_pods_in_namespace(ns_bulk)
-                                for item, result in results.items():
+                        if selected_dep:
+                            ns, name = selected_dep.split('/')
+                            current_replicas = replicas_by_id[(ns, name)]
+                            
+                            new_replicas = st.number_input("Replicas", min_value=0, value=current_replicas)
+                            
+                            col2a, col2b = st.columns(2)
+                            with col2a:
+                                if st.button("📈 Scale"):
+                                    result = scale_deployment(ns, name, new_replicas)
+                                    _clear_caches()
                                     st.write(result)
-        
-        else:  # Deployments
-            deployments = get_all_deployments()
-            if deployments and 'error' not in deployments[0]:
-                ns_deps = {}
-                for dep in deployments:
-                    if 'error' not in dep:
-                        ns = dep['namespace']
-                        if ns not in ns_deps:
-                            ns_deps[ns] = []
-                        ns_deps[ns].append(dep)
-                
-                selected_ns_dep = st.selectbox("Namespace", list(ns_deps.keys()), key="bulk_dep_ns")
-                
-                if selected_ns_dep:
-                    dep_names = [dep['name'] for dep in ns_deps[selected_ns_dep]]
-                    selected_deps = st.multiselect("Select Deployments", dep_names)
+                            with col2b:
+                                if st.button("🔄 Restart Deployment"):
+                                    result = restart_deployment(ns, name)
+                                    _clear_caches()
+                                    st.write(result)
+        _quick_actions_tab()
+    
+    with tab3:
+        @st.fragment
+        def _bulk_operations_tab():
+            st.subheader("Bulk Operations")
+            
+            # One check up front; an unreachable cluster skips every picker below
+            namespaces, ns_error = namespaces_or_error(st.session_state.kubeconfig_path)
+            if ns_error:
+                st.error(f"❌ Failed to list namespaces: {ns_error}")
+                return
+            
+            bulk_type = st.radio("Operation Type", ["Pods", "Deployments"], horizontal=True)
+            
+            if bulk_type == "Pods":
+                ns_bulk = st.selectbox("Namespace", namespaces, key="bulk_ns")
+                if ns_bulk:
+                    pods = cached_all_pods(st.session_state.kubeconfig_path, ns_bulk)
+                    pod_names = [pod['name'] for pod in pods if 'error' not in pod]
                     
-                    if selected_deps:
-                        col1, col2 = st.columns(2)
+                    if pod_names:
+                        selected_pods = searchable_multiselect("Select Pods", pod_names, key="bulk_pods")
                         
-                        with col1:
-                            if st.button("🔄 Bulk Restart Deployments"):
-                                results = bulk_restart_deployments(selected_ns_dep, selected_deps)
-                                for dep, result in results.items():
-                                    st.write(f"{dep}: {result}")
+                        if selected_pods:
+                            col1, col2, col3 = st.columns(3)
+                            
+                            with col1:
+                                if st.button("🔄 Bulk Restart Pods"):
+                                    results = bulk_restart_pods(ns_bulk, selected_pods)
+                                    _clear_caches()
+                                    results_table(results)
+                            
+                            with col2:
+                                if st.button("🗑️ Bulk Delete Pods"):
+                                    results = bulk_delete_pods(ns_bulk, selected_pods)
+                                    _clear_caches()
+                                    results_table(results)
+                            
+                            with col3:
+                                if st.button("🔄 Restart All Pods in NS"):
+                                    results = restart_all_pods_in_namespace(ns_bulk)
+                                    _clear_caches()
+                                    results_table(results)
+            
+            else:  # Deployments
+                deployments = cached_all_deployments(st.session_state.kubeconfig_path)
+                replicas_by_id = {(d['namespace'], d['name']): d['replicas'] for d in deployments if 'error' not in d}
+                if deployments and 'error' not in deployments[0]:
+                    ns_deps = collections.defaultdict(list)
+                    for dep in deployments:
+                        if 'error' not in dep:
+                            ns_deps[dep['namespace']].append(dep)
+                    
+                    selected_ns_dep = st.selectbox("Namespace", sorted(ns_deps), key="bulk_dep_ns")
+                    
+                    if selected_ns_dep:
+                        dep_names = [dep['name'] for dep in ns_deps[selected_ns_dep]]
+                        selected_deps = searchable_multiselect("Select Deployments", dep_names, key="bulk_deps")
                         
-                        with col2:
-                            # Scale configuration
-                            st.write("**Bulk Scale Configuration**")
-                            scale_configs = {}
-                            for dep_name in selected_deps:
-                                current = next(d['replicas'] for d in ns_deps[selected_ns_dep] if d['name'] == dep_name)
-                                scale_configs[dep_name] = st.number_input(
-                                    f"{dep_name} replicas", 
-                                    min_value=0, 
-                                    value=current,
-                                    key=f"scale_{dep_name}"
-                                )
+                        if selected_deps:
+                            col1, col2 = st.columns(2)
                             
-                            if st.button("📈 Bulk Scale"):
-                                results = bulk_scale_deployments(selected_ns_dep, scale_configs)
-                                for dep, result in results.items():
-                                    st.write(f"{dep}: {result}")
+                            with col1:
+                                if st.button("🔄 Bulk Restart Deployments"):
+                                    results = bulk_restart_deployments(selected_ns_dep, selected_deps)
+                                    _clear_caches()
+                                    results_table(results)
+                            
+                            with col2:
+                                # Scale configuration
+                                st.write("**Bulk Scale Configuration**")
+                                scale_configs = {}
+                                for dep_name in selected_deps:
+                                    current = replicas_by_id[(selected_ns_dep, dep_name)]
+                                    scale_configs[dep_name] = st.number_input(
+                                        f"{dep_name} replicas", 
+                                        min_value=0, 
+                                        value=current,
+                                        key=f"scale_{dep_name}"
+                                    )
+                                
+                                if st.button("📈 Bulk Scale"):
+                                    results = bulk_scale_deployments(selected_ns_dep, scale_configs)
+                                    _clear_caches()
+                                    results_table(results)
+        _bulk_operations_tab()
     
     with tab4:
-        st.subheader("Problem Detection & Resolution")
-        
-        try:
-            problems = get_problematic_pods()
+        @st.fragment
+        def _problems_tab():
+            st.subheader("Problem Detection & Resolution")
             
-            if problems:
-                st.error(f"Found {len(problems)} problematic pods")
+            try:
+                problems = cached_problematic_pods(st.session_state.kubeconfig_path)
                 
-                for pod in problems:
-                    with st.expander(f"❌ {pod['namespace']}/{pod['name']} - {pod['phase']}"):
-                        col1, col2, col3 = st.columns([2, 2, 1])
-                        
-                        with col1:
-                            st.write(f"**Status:** {pod['phase']}")
-                            st.write(f"**Ready:** {'Yes' if pod.get('ready', False) else 'No'}")
-                        
-                        with col2:
-                            st.write(f"**Restarts:** {pod.get('restarts', 0)}")
-                            st.write(f"**Node:** {pod.get('node', 'Unknown')}")
-                        
-                        with col3:
-                            if st.button("🔄 Fix", key=f"fix_{pod['namespace']}_{pod['name']}"):
-                                result = restart_pod(pod['namespace'], pod['name'])
-                                st.write(result)
-            else:
-                st.success("✅ No problematic pods found! Cluster is healthy.")
-                
-        except Exception as e:
-            st.error(f"Failed to check for problems: {e}")
+                if problems:
+                    st.error(f"Found {len(problems)} problematic pods")
+                    
+                    # One table and one picker instead of an expander and button per pod
+                    df = pd.DataFrame(problems)[['namespace', 'name', 'phase', 'ready', 'restarts', 'node']]
+                    st.dataframe(df, use_container_width=True, hide_index=True)
+                    
+                    pods_by_label = {f"{pod['namespace']}/{pod['name']}": pod for pod in problems}
+                    selected = searchable_selectbox("Fix which pod?", list(pods_by_label), key="fix_pod")
+                    if selected and st.button("🔄 Fix", key="fix_selected"):
+                        pod = pods_by_label[selected]
+                        result = restart_pod(pod['namespace'], pod['name'])
+                        _clear_caches()
+                        st.write(result)
+                else:
+                    st.success("✅ No problematic pods found! Cluster is healthy.")
+                    
+            except Exception as e:
+                st.error(f"Failed to check for problems: {e}")
+        _problems_tab()
 
 # Footer info
 if st.session_state.cluster_connected:
     st.markdown("---")
     st.markdown("💡 **Tip:** Your session is automatically saved. You can refresh the browser without losing connection.")
+
+# Cache hit/miss counters for tuning, drawn last so they include this run, shown with ?debug=1
+if st.query_params.get("debug") == "1":
+    with st.sidebar.expander("Cache Stats"):
+        st.dataframe(pd.DataFrame(cache_stats()), use_container_width=True, hide_index=True)
@@ -0,0 +1,183 @@
+# k8s_connector/cluster_cache.py
+"""
+Watch-backed cluster state cache
+Keeps pods and deployments in memory so long-running loops stop re-listing the API server
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from kubernetes import client, watch
+from kubernetes.client.exceptions import ApiException
+from k8s_connector.cluster_connector import get_api_client, new_api_client
+
+logger = logging.getLogger(__name__)
+
+# Retry delays after a failed list/watch double from the first value up to the cap
+BACKOFF_INITIAL_SECONDS = 1
+BACKOFF_MAX_SECONDS = 60
+
+
+def _is_gone(event: Dict[str, Any]) -> bool:
+    """True for a watch ERROR event carrying 410 Gone (resource version expired)"""
+    obj = event.get('raw_object') or event.get('object')
+    code = obj.get('code') if isinstance(obj, dict) else getattr(obj, 'code', None)
+    return code == 410
+
+
+class ClusterStateCache:
+    """In-memory pods/deployments kept current by watch streams"""
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    # Caches owned by one kubeconfig each, for processes serving several clusters at once
+    _by_kubeconfig: Dict[str, 'ClusterStateCache'] = {}
+    
+    def __init__(self, resync_seconds: int = 60, api_client: client.ApiClient = None):
+        self.resync_seconds = resync_seconds
+        self.api_client = api_client or get_api_client()
+        self._lock = threading.RLock()
+        self._stores: Dict[str, Dict[Tuple[str, str], Any]] = {'pods': {}, 'deployments': {}}
+        self._synced = {kind: threading.Event() for kind in self._stores}
+        self._stopped = threading.Event()
+    
+    @classmethod
+    def ensure_started(cls, resync_seconds: int = 60) -> 'ClusterStateCache':
+        """Start the process-wide cache once and return it"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cache = cls(resync_seconds)
+                cache._start()
+                cls._instance = cache
+            return cls._instance
+    
+    @classmethod
+    def active(cls) -> Optional['ClusterStateCache']:
+        """Return the running cache, or None when nothing started it"""
+        return cls._instance
+    
+    @classmethod
+    def stop_active(cls):
+        """Stop the running cache, e.g. before switching to another cluster"""
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance._stopped.set()
+                cls._instance = None
+    
+    @classmethod
+    def for_kubeconfig(cls, kubeconfig_path: str, resync_seconds: int = 60) -> 'ClusterStateCache':
+        """
+        Return the running cache for this kubeconfig, starting it on first use
+        Each one watches through its own ApiClient, independent of the default configuration
+        """
+        with cls._instance_lock:
+            cache = cls._by_kubeconfig.get(kubeconfig_path)
+            if cache is None or cache._stopped.is_set():
+                cache = cls(resync_seconds, new_api_client(kubeconfig_path))
+                cache._start()
+                cls._by_kubeconfig[kubeconfig_path] = cache
+            return cache
+    
+    @classmethod
+    def stop_kubeconfig(cls, kubeconfig_path: str):
+        """Stop the cache started for this kubeconfig, if any"""
+        with cls._instance_lock:
+            cache = cls._by_kubeconfig.pop(kubeconfig_path, None)
+            if cache is not None:
+                cache._stopped.set()
+    
+    def _start(self):
+        """Launch one daemon watcher thread per resource kind"""
+        v1 = client.CoreV1Api(self.api_client)
+        apps_v1 = client.AppsV1Api(self.api_client)
+        watchers = {
+            'pods': v1.list_pod_for_all_namespaces,
+            'deployments': apps_v1.list_deployment_for_all_namespaces,
+        }
+        for kind, list_fn in watchers.items():
+            thread = threading.Thread(target=self._run, args=(kind, list_fn), name=f"autokubex-{kind}-watch", daemon=True)
+            thread.start()
+    
+    def _run(self, kind: str, list_fn):
+        """List once, then keep re-watching from the last seen resource version; relist only on 410 Gone"""
+        store = self._stores[kind]
+        resource_version = None
+        backoff = BACKOFF_INITIAL_SECONDS
+        while not self._stopped.is_set():
+            watcher = None
+            try:
+                if resource_version is None:
+                    listing = list_fn()
+                    with self._lock:
+                        store.clear()
+                        for obj in listing.items:
+                            store[(obj.metadata.namespace, obj.metadata.name)] = obj
+                    resource_version = listing.metadata.resource_version
+                    self._synced[kind].set()
+                
+                # Bookmarks advance the resource version on quiet streams so the resync timeout resumes instead of relisting
+                watcher = watch.Watch()
+                stream = watcher.stream(
+                    list_fn,
+                    resource_version=resource_version,
+                    timeout_seconds=self.resync_seconds,
+                    allow_watch_bookmarks=True
+                )
+                for event in stream:
+                    if self._stopped.is_set():
+                        return
+                    if event['type'] == 'ERROR':
+                        if not _is_gone(event):
+                            raise RuntimeError(f"watch error event: {event.get('raw_object') or event.get('object')}")
+                        logger.info("%s watch expired at resource version %s, relisting", kind, resource_version)
+                        resource_version = None
+                        break
+                    if event['type'] == 'BOOKMARK':
+                        continue
+                    obj = event['object']
+                    key = (obj.metadata.namespace, obj.metadata.name)
+                    with self._lock:
+                        if event['type'] == 'DELETED':
+                            store.pop(key, None)
+                        else:
+                            store[key] = obj
+                else:
+                    resource_version = watcher.resource_version or resource_version
+                backoff = BACKOFF_INITIAL_SECONDS
+            except ApiException as e:
+                if e.status == 410:
+                    # Newer clients raise expired-watch ERROR events instead of yielding them
+                    logger.info("%s watch expired at resource version %s, relisting", kind, resource_version)
+                    resource_version = None
+                    continue
+                if watcher is not None:
+                    resource_version = watcher.resource_version or resource_version
+                logger.warning("%s watch failed (HTTP %s), retrying in %ss: %s", kind, e.status, backoff, e.reason)
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, BACKOFF_MAX_SECONDS)
+            except Exception as e:
+                # Resume from the last seen resource version; only 410 forces a full relist
+                if watcher is not None:
+                    resource_version = watcher.resource_version or resource_version
+                logger.warning("%s watch interrupted, retrying in %ss: %s", kind, backoff, e)
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, BACKOFF_MAX_SECONDS)
+    
+    def _snapshot(self, kind: str, namespace: str = None, timeout: float = 10.0) -> Optional[List[Any]]:
+        """Return cached objects, or None if the first list has not completed in time"""
+        if not self._synced[kind].wait(timeout):
+            return None
+        with self._lock:
+            if namespace:
+                return [obj for (ns, _), obj in self._stores[kind].items() if ns == namespace]
+            return list(self._stores[kind].values())
+    
+    def pods(self, namespace: str = None) -> Optional[List[Any]]:
+        """Cached V1Pod objects, optionally limited to one namespace"""
+        return self._snapshot('pods', namespace)
+    
+    def deployments(self, namespace: str = None) -> Optional[List[Any]]:
+        """Cached V1Deployment objects, optionally limited to one namespace"""
+        return self._snapshot('deployments', namespace)
@@ -1,4 +1,4 @@
-from kubernetes import config
+from kubernetes import client, config
 import os
 import sys
 
@@ -8,23 +8,98 @@ sys.path.insert(0, ROOT)
 
 from k8s_connector.kubeconfig_detector import find_working_kubeconfig
 
+# Bulk actions fan out many calls to one apiserver; the client default pool of 4 forces reconnects
+CONNECTION_POOL_MAXSIZE = 64
 
-def load_cluster(kubeconfig_path: str = None):
+# Identifies our traffic in apiserver logs and priority & fairness flow schemas
+USER_AGENT = "AutoKubeX/1.0 (python-kubernetes)"
+
+# urllib3 retries for connection-level failures on pooled keep-alive sockets
+REQUEST_RETRIES = 3
+
+_api_client = None
+
+# (path, mtime_ns) of the kubeconfig currently loaded as the default configuration
+_active_kubeconfig = None
+
+
+def _pooled_configuration(kubeconfig_path: str = None, config_dict: dict = None) -> client.Configuration:
+    """Build a client configuration with an enlarged connection pool"""
+    if config_dict is not None:
+        client_config = client.Configuration()
+        config.load_kube_config_from_dict(config_dict, client_configuration=client_config)
+    elif kubeconfig_path:
+        client_config = client.Configuration()
+        config.load_kube_config(config_file=kubeconfig_path, client_configuration=client_config)
+    else:
+        client_config = client.Configuration.get_default_copy()
+    client_config.connection_pool_maxsize = CONNECTION_POOL_MAXSIZE
+    client_config.retries = REQUEST_RETRIES
+    return client_config
+
+
+def _new_api_client(client_config: client.Configuration) -> client.ApiClient:
+    """Build an ApiClient that identifies itself as AutoKubeX"""
+    api_client = client.ApiClient(client_config)
+    api_client.user_agent = USER_AGENT
+    return api_client
+
+
+def _activate_kubeconfig(kubeconfig_path: str, config_dict: dict = None):
+    """Load a kubeconfig as the default configuration and rebuild the shared API client"""
+    global _api_client, _active_kubeconfig
+    client_config = _pooled_configuration(kubeconfig_path, config_dict)
+    client.Configuration.set_default(client_config)
+    _api_client = _new_api_client(client_config)
+    _active_kubeconfig = (kubeconfig_path, os.stat(kubeconfig_path).st_mtime_ns)
+
+
+def new_api_client(kubeconfig_path: str) -> client.ApiClient:
+    """
+    Build a pooled ApiClient dedicated to one kubeconfig
+    The default configuration and the shared client are left as they are
+    """
+    return _new_api_client(_pooled_configuration(kubeconfig_path))
+
+
+def is_kubeconfig_active(kubeconfig_path: str) -> bool:
+    """Check whether this kubeconfig, unchanged on disk, is already the loaded configuration"""
+    if _active_kubeconfig is None or _active_kubeconfig[0] != kubeconfig_path:
+        return False
+    try:
+        return os.stat(kubeconfig_path).st_mtime_ns == _active_kubeconfig[1]
+    except OSError:
+        return False
+
+
+def get_api_client() -> client.ApiClient:
+    """
+    Return the shared pooled ApiClient
+    Action modules pass this to the API classes so calls reuse keep-alive connections
+    """
+    global _api_client
+    if _api_client is None:
+        _api_client = _new_api_client(_pooled_configuration())
+    return _api_client
+
+
+def load_cluster(kubeconfig_path: str = None, config_dict: dict = None):
     """
     Load Kubernetes cluster configuration
     If no path provided, auto-detect from environment
+    Pass config_dict when the caller already holds the parsed kubeconfig to skip re-reading the file
     """
     try:
         if kubeconfig_path:
             # Use provided path
-            config.load_kube_config(config_file=kubeconfig_path)
+            _activate_kubeconfig(kubeconfig_path, config_dict)
             print(f"[+] Connected to cluster using: {kubeconfig_path}")
             return {"status": "connected", "cluster_name": "Kubernetes Cluster", "path": kubeconfig_path}
         else:
             # Auto-detect kubeconfig
             working_config = find_working_kubeconfig()
             if working_config:
-                config.load_kube_config(config_file=working_config['path'])
+                _activate_kubeconfig(working_config['path'])
                 cluster_name = working_config['validation']['current_context'] or "Kubernetes Cluster"
                 print(f"[+] Auto-detected and connected to cluster: {cluster_name}")
                 print(f"[+] Using kubeconfig: {working_config['path']}")
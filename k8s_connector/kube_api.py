@@ -1,19 +1,27 @@
-from kubernetes import client
+from k8s_connector.cluster_connector import get_api_client
+
+# Ask the apiserver for its printed table instead of full Pod objects
+_TABLE_ACCEPT = 'application/json;as=Table;v=1;g=meta.k8s.io'
+
+def _list_pods_lite():
+    """Yield (namespace, name, status, ready) per pod from a server-side Table served by the watch cache"""
+    table = get_api_client().call_api(
+        '/api/v1/pods', 'GET',
+        query_params=[('resourceVersion', '0'), ('resourceVersionMatch', 'NotOlderThan')],
+        header_params={'Accept': _TABLE_ACCEPT},
+        auth_settings=['BearerToken'],
+        response_type='object',
+        _return_http_data_only=True
+    )
+    columns = [column['name'] for column in table['columnDefinitions']]
+    name_i, ready_i, status_i = columns.index('Name'), columns.index('Ready'), columns.index('Status')
+    for row in table.get('rows') or []:
+        cells = row['cells']
+        ready, _, total = cells[ready_i].partition('/')
+        yield row['object']['metadata']['namespace'], cells[name_i], cells[status_i], ready == total
 
 def get_pod_issues():
-    v1 = client.CoreV1Api()
-    pods = v1.list_pod_for_all_namespaces()
-    unhealthy = []
-    for pod in pods.items:
-        for cs in pod.status.container_statuses or []:
-            if not cs.ready:
-                unhealthy.append((pod.metadata.namespace, pod.metadata.name))
-    return unhealthy
+    return [(namespace, name) for namespace, name, _, ready in _list_pods_lite() if not ready]
 
 def get_cluster_summary():
-    v1 = client.CoreV1Api()
-    summary = []
-    pods = v1.list_pod_for_all_namespaces()
-    for pod in pods.items:
-        summary.append(f"{pod.metadata.namespace}/{pod.metadata.name} - {pod.status.phase}")
-    return "\n".join(summary)
\ No newline at end of file
+    return "\n".join(f"{namespace}/{name} - {status}" for namespace, name, status, _ in _list_pods_lite())
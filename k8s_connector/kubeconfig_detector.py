@@ -6,50 +6,178 @@ Automatically detects and validates kubeconfig files
 
 import os
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 
+# libyaml-backed loader when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+# Fixed candidates, expanded once; HOME does not change within a run
+_DEFAULT_PATH = os.path.expanduser('~/.kube/config')
+_COMMON_PATHS_EXPANDED = tuple(os.path.expanduser(path) for path in (
+    '/Users/hrushi/DevBoxLite/mixed-os-cluster-config.yaml',
+    '/Users/hrushi/.kube/config',
+    './kubeconfig',
+    './config',
+    '~/.k8s/config',
+    '/tmp/kubeconfig'
+))
+
 
 def detect_kubeconfig_paths() -> List[str]:
     """
     Detect potential kubeconfig file paths from various sources
+    Memoized per KUBECONFIG value; call _detect_kubeconfig_paths.cache_clear() to reset
     """
-    paths = []
+    return list(_detect_kubeconfig_paths(os.environ.get('KUBECONFIG')))
+
+
+@lru_cache(maxsize=1)
+def _detect_kubeconfig_paths(env_kubeconfig: Optional[str]) -> tuple:
+    """Build the candidate list for one KUBECONFIG value"""
+    # Keyed by normalized path so ./config and config collapse; the first spelling seen is kept
+    seen: Dict[str, str] = {}
     
     # 1. Environment variable KUBECONFIG
-    env_kubeconfig = os.environ.get('KUBECONFIG')
     if env_kubeconfig:
         # Handle multiple paths separated by ':'
         for path in env_kubeconfig.split(':'):
             if path.strip():
-                paths.append(os.path.expanduser(path.strip()))
+                expanded_path = os.path.expanduser(path.strip())
+                seen.setdefault(os.path.normpath(expanded_path), expanded_path)
     
-    # 2. Default kubectl location
-    default_path = os.path.expanduser('~/.kube/config')
-    if default_path not in paths:
-        paths.append(default_path)
+    # 2. Default kubectl location, then 3. common development locations
+    for expanded_path in (_DEFAULT_PATH,) + _COMMON_PATHS_EXPANDED:
+        seen.setdefault(os.path.normpath(expanded_path), expanded_path)
     
-    # 3. Common development locations
-    common_paths = [
-        '/Users/hrushi/DevBoxLite/mixed-os-cluster-config.yaml',
-        '/Users/hrushi/.kube/config',
-        './kubeconfig',
-        './config',
-        '~/.k8s/config',
-        '/tmp/kubeconfig'
-    ]
+    return tuple(seen.values())
+
+
+# Plain scalars YAML resolves to null
+_NULL_SCALARS = frozenset(('', '~', 'null', 'Null', 'NULL'))
+
+
+def _skip_node(event, events):
+    """Consume the rest of a node whose first event was already read"""
+    if isinstance(event, yaml.CollectionStartEvent):
+        depth = 1
+        for event in events:
+            if isinstance(event, yaml.CollectionStartEvent):
+                depth += 1
+            elif isinstance(event, yaml.CollectionEndEvent):
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def _scalar(event) -> Optional[str]:
+    """A scalar event's value with YAML nulls as None; None for anything that is not a scalar"""
+    if not isinstance(event, yaml.ScalarEvent):
+        return None
+    if event.implicit[0] and event.value in _NULL_SCALARS:
+        return None
+    return event.value
+
+
+def _named_items(events) -> tuple:
+    """Read a sequence's items, returning (item count, 'name' of each mapping item)"""
+    count, names = 0, []
+    for item in events:
+        if isinstance(item, yaml.SequenceEndEvent):
+            break
+        count += 1
+        if not isinstance(item, yaml.MappingStartEvent):
+            _skip_node(item, events)
+            continue
+        name = None
+        for key in events:
+            if isinstance(key, yaml.MappingEndEvent):
+                break
+            _skip_node(key, events)
+            value = next(events)
+            if _scalar(key) == 'name':
+                name = _scalar(value)
+            _skip_node(value, events)
+        names.append(name)
+    return count, names
+
+
+class _AliasFound(Exception):
+    """Raised by the event scan when the document uses an alias it cannot resolve"""
+
+
+def _parse_events(data: bytes):
+    """yaml.parse, stopping at the first alias; anchors can carry names or whole sections"""
+    for event in yaml.parse(data, Loader=_YAML_LOADER):
+        if isinstance(event, yaml.AliasEvent):
+            raise _AliasFound()
+        yield event
+
+
+def _scan_kubeconfig(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Pull clusters, contexts and current-context from the YAML event stream
+    Everything else, certificate data included, is skipped without building Python objects
+    Returns None when the document root is not a mapping; raises _AliasFound for documents using aliases
+    """
+    events = _parse_events(data)
+    root = next((event for event in events if isinstance(event, yaml.NodeEvent)), None)
+    if not isinstance(root, yaml.MappingStartEvent):
+        return None
     
-    for path in common_paths:
-        expanded_path = os.path.expanduser(path)
-        if expanded_path not in paths:
-            paths.append(expanded_path)
+    config = {'clusters': (0, []), 'contexts': (0, []), 'current-context': None}
+    for key in events:
+        if isinstance(key, yaml.MappingEndEvent):
+            break
+        _skip_node(key, events)
+        value = next(events)
+        name = _scalar(key)
+        if name in ('clusters', 'contexts'):
+            if isinstance(value, yaml.SequenceStartEvent):
+                config[name] = _named_items(events)
+                continue
+            config[name] = (0, [])
+        elif name == 'current-context':
+            config[name] = _scalar(value)
+        _skip_node(value, events)
+    return config
+
+
+def _load_kubeconfig(data: bytes) -> Optional[Dict[str, Any]]:
+    """Same result as _scan_kubeconfig, from a full load that resolves anchors and aliases"""
+    document = yaml.load(data, Loader=_YAML_LOADER)
+    if not isinstance(document, dict):
+        return None
     
-    return paths
+    config = {'current-context': document.get('current-context')}
+    for name in ('clusters', 'contexts'):
+        items = document.get(name)
+        if not isinstance(items, list):
+            items = []
+        config[name] = (len(items), [item.get('name') for item in items if isinstance(item, dict)])
+    return config
 
 
 def validate_kubeconfig(path: str) -> Dict[str, Any]:
     """
     Validate a kubeconfig file and extract basic info
+    Files unchanged since the last call are not re-read or re-parsed
     """
+    # One stat answers both "does it exist" and "has it changed"; size catches same-tick rewrites
+    try:
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = None
+    result = _validate_kubeconfig(path, version)
+    return {**result, 'clusters': list(result['clusters']), 'contexts': list(result['contexts'])}
+
+
+@lru_cache(maxsize=32)
+def _validate_kubeconfig(path: str, version: Optional[tuple]) -> Dict[str, Any]:
+    """Validate one version of a kubeconfig, memoized by path and (mtime_ns, size)"""
     result = {
         'valid': False,
         'path': path,
@@ -61,32 +189,40 @@ def validate_kubeconfig(path: str) -> Dict[str, Any]:
     }
     
     try:
-        if not os.path.exists(path):
+        if version is None:
             result['error'] = f"File does not exist: {path}"
             return result
         
         result['exists'] = True
         
-        with open(path, 'r') as f:
-            config = yaml.safe_load(f)
+        with open(path, 'rb') as f:
+            data = f.read()
         
-        if not isinstance(config, dict):
+        # Both sections are required, so a file that never names them is rejected without parsing
+        if b'clusters' not in data or b'contexts' not in data:
+            result['error'] = "Missing clusters or contexts in kubeconfig"
+            return result
+        
+        try:
+            config = _scan_kubeconfig(data)
+        except _AliasFound:
+            config = _load_kubeconfig(data)
+        
+        if config is None:
             result['error'] = "Invalid YAML structure"
             return result
         
         # Extract cluster info
-        clusters = config.get('clusters', [])
-        result['clusters'] = [c.get('name') for c in clusters if isinstance(c, dict)]
+        cluster_count, result['clusters'] = config['clusters']
         
         # Extract context info
-        contexts = config.get('contexts', [])
-        result['contexts'] = [c.get('name') for c in contexts if isinstance(c, dict)]
+        context_count, result['contexts'] = config['contexts']
         
         # Current context
-        result['current_context'] = config.get('current-context')
+        result['current_context'] = config['current-context']
         
         # Basic validation
-        if clusters and contexts:
+        if cluster_count and context_count:
             result['valid'] = True
         else:
             result['error'] = "Missing clusters or contexts in kubeconfig"
@@ -99,15 +235,11 @@ def validate_kubeconfig(path: str) -> Dict[str, Any]:
     return result
 
 
-def find_working_kubeconfig() -> Optional[Dict[str, Any]]:
-    """
-    Find the first working kubeconfig from detected paths
-    """
-    paths = detect_kubeconfig_paths()
-    
-    for path in paths:
-        validation = validate_kubeconfig(path)
+def _first_working(validations) -> Optional[Dict[str, Any]]:
+    """Describe the first valid entry of an iterable of validation results"""
+    for validation in validations:
         if validation['valid']:
+            path = validation['path']
             return {
                 'path': path,
                 'validation': validation,
@@ -117,25 +249,44 @@ def find_working_kubeconfig() -> Optional[Dict[str, Any]]:
     return None
 
 
+def find_working_kubeconfig(paths: List[str] = None, validations: List[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Find the first working kubeconfig from detected paths
+    Pass paths when the caller already ran detection, or validations when it already validated them
+    """
+    if validations is not None:
+        return _first_working(validations)
+    if paths is None:
+        paths = detect_kubeconfig_paths()
+    
+    # Lazy, so candidates after the first valid one are never validated
+    return _first_working(validate_kubeconfig(path) for path in paths)
+
+
 def get_kubeconfig_status() -> Dict[str, Any]:
     """
     Get comprehensive status of kubeconfig detection
     """
     paths = detect_kubeconfig_paths()
-    validations = []
-    
-    for path in paths:
-        validation = validate_kubeconfig(path)
-        validations.append(validation)
+    # Candidates are independent files; overlap their stats and reads (map keeps detection order)
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+        validations = list(executor.map(validate_kubeconfig, paths))
     
-    working = find_working_kubeconfig()
+    # The default path is always a candidate, so its validation already knows whether it exists
+    default_key = os.path.normpath(_DEFAULT_PATH)
+    default_exists = next(
+        (v['exists'] for v in validations if os.path.normpath(v['path']) == default_key),
+        None
+    )
+    if default_exists is None:
+        default_exists = os.path.exists(_DEFAULT_PATH)
     
     return {
         'detected_paths': paths,
         'validations': validations,
-        'working_config': working,
+        'working_config': find_working_kubeconfig(validations=validations),
         'environment_kubeconfig': os.environ.get('KUBECONFIG'),
-        'default_exists': os.path.exists(os.path.expanduser('~/.kube/config'))
+        'default_exists': default_exists
     }
 
 
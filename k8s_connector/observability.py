@@ -1,8 +1,38 @@
-import requests
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Shared session so repeated metric polls reuse the TCP/TLS connection to Prometheus
+_session = None
+
+def _get_session():
+    """Create the Prometheus session on first use; importing requests is deferred until a metric is fetched"""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        _session = session
+    return _session
+
+# (connect, read) seconds, so an unreachable Prometheus cannot hang the caller
+PROMETHEUS_TIMEOUT = (2, 5)
+
+def _loads(data: bytes):
+    """Deserialize a JSON response body"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 def get_prometheus_metrics(prometheus_url: str):
     try:
-        response = requests.get(f"{prometheus_url}/api/v1/query?query=up")
+        response = _get_session().get(f"{prometheus_url}/api/v1/query", params={"query": "up"}, timeout=PROMETHEUS_TIMEOUT)
         if response.ok:
             results = response.json().get("data", {}).get("result", [])
             return results
@@ -11,8 +41,25 @@ def get_prometheus_metrics(prometheus_url: str):
         return [f"[Error fetching metrics]: {str(e)}"]
 
 
-def get_k8s_events():
+def iter_k8s_events():
+    """Yield (object name, message) for Warning events, read from the raw JSON body rather than client models"""
     from kubernetes import client
-    v1 = client.CoreV1Api()
-    events = v1.list_event_for_all_namespaces()
-    return [(e.involved_object.name, e.message) for e in events.items if e.type == "Warning"]
+    from k8s_connector.cluster_connector import get_api_client
+    v1 = client.CoreV1Api(get_api_client())
+    # Filter in the apiserver and serve from its watch cache rather than pulling every event through etcd
+    response = v1.list_event_for_all_namespaces(
+        field_selector="type=Warning",
+        resource_version="0",
+        resource_version_match="NotOlderThan",
+        _preload_content=False
+    )
+    try:
+        events = _loads(response.data)
+    finally:
+        response.release_conn()
+    for event in events.get("items") or []:
+        yield (event.get("involvedObject") or {}).get("name"), event.get("message")
+
+
+def get_k8s_events():
+    return list(iter_k8s_events())
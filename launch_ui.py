@@ -63,6 +63,19 @@ def main():
     if args.dev:
         cmd.extend(["--server.runOnSave", "true"])
     
+    # Outside dev mode, become the streamlit process instead of idling as its parent
+    # (Windows emulates exec with a child process, so keep the supervising parent there)
+    if not args.dev and os.name != "nt":
+        os.chdir(project_root)
+        # execv replaces the process without flushing Python's buffers
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            os.execv(cmd[0], cmd)
+        except OSError as e:
+            print(f"❌ Error starting web UI: {e}")
+            sys.exit(1)
+    
     try:
         # Run streamlit
         subprocess.run(cmd, cwd=project_root)
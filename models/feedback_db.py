@@ -1,42 +1,118 @@
 import sqlite3
 from datetime import datetime
+import atexit
 import os
+import threading
+import time
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "feedback.db")
 
+# One connection per thread, opened on first use and closed at exit
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+
+def _get_conn():
+    """Return this thread's connection, opening it in WAL mode on first use"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+        with _connections_lock:
+            _connections.append(conn)
+    return conn
+
+def _close_all():
+    with _connections_lock:
+        for conn in _connections:
+            conn.close()
+        _connections.clear()
+
+atexit.register(_close_all)
+
+_CREATE_FEEDBACK = """
+  CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    prompt TEXT,
+    cluster_snapshot TEXT,
+    ai_response TEXT,
+    rating INTEGER,
+    timestamp INTEGER NOT NULL
+  )
+"""
+
+def _iso_to_ns(timestamp):
+    """Convert a legacy ISO timestamp to epoch nanoseconds, 0 when missing or unparseable"""
+    try:
+        return int(datetime.fromisoformat(timestamp).timestamp() * 1_000_000_000)
+    except (TypeError, ValueError):
+        return 0
+
+def _migrate_text_timestamps(conn):
+    """Rebuild a table created with ISO TEXT timestamps so they become epoch nanoseconds"""
+    # One explicit transaction so a failure rolls the rename back too
+    conn.execute("BEGIN IMMEDIATE")
+    with conn:
+        conn.execute("ALTER TABLE feedback RENAME TO feedback_legacy")
+        conn.execute(_CREATE_FEEDBACK)
+        rows = conn.execute("SELECT id, prompt, cluster_snapshot, ai_response, rating, timestamp FROM feedback_legacy")
+        conn.executemany(
+            "INSERT INTO feedback (id, prompt, cluster_snapshot, ai_response, rating, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+            (row[:5] + (_iso_to_ns(row[5]),) for row in rows.fetchall())
+        )
+        conn.execute("DROP TABLE feedback_legacy")
+
+def feedback_datetime(timestamp_ns):
+    """Turn a stored feedback timestamp back into a local datetime for display"""
+    return datetime.fromtimestamp(timestamp_ns / 1_000_000_000)
+
 def init_feedback_db():
-    conn = sqlite3.connect(DB_PATH)
+    conn = _get_conn()
     c = conn.cursor()
-    c.execute("""
-      CREATE TABLE IF NOT EXISTS feedback (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        prompt TEXT,
-        cluster_snapshot TEXT,
-        ai_response TEXT,
-        rating INTEGER,
-        timestamp TEXT
-      )
-    """)
+    c.execute(_CREATE_FEEDBACK)
+    columns = {row[1]: row[2] for row in c.execute("PRAGMA table_info(feedback)")}
+    if columns.get('timestamp', '').upper() == 'TEXT':
+        _migrate_text_timestamps(conn)
+    # Lets ORDER BY timestamp DESC walk the index instead of sorting the whole table
+    c.execute("CREATE INDEX IF NOT EXISTS idx_feedback_ts ON feedback(timestamp DESC)")
     conn.commit()
-    conn.close()
+
+_INSERT_FEEDBACK = """
+  INSERT INTO feedback (prompt, cluster_snapshot, ai_response, rating, timestamp)
+  VALUES (?, ?, ?, ?, ?)
+"""
 
 def store_feedback(prompt, cluster_snapshot, ai_response, rating):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
-      INSERT INTO feedback (prompt, cluster_snapshot, ai_response, rating, timestamp)
-      VALUES (?, ?, ?, ?, ?)
-    """, (prompt, cluster_snapshot, ai_response, rating, datetime.now().isoformat()))
+    conn = _get_conn()
+    conn.execute(_INSERT_FEEDBACK, (prompt, cluster_snapshot, ai_response, rating, time.time_ns()))
     conn.commit()
-    conn.close()
+
+def store_feedback_many(rows):
+    """
+    Insert (prompt, cluster_snapshot, ai_response, rating, timestamp) rows in one transaction, one commit for all
+    timestamp is epoch nanoseconds, as from time.time_ns(); if any row fails, none are written
+    """
+    conn = _get_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(_INSERT_FEEDBACK, rows)
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+
+def iter_feedback(limit=None):
+    """Yield feedback rows newest first straight from the cursor, optionally stopping after limit rows"""
+    query = "SELECT * FROM feedback ORDER BY timestamp DESC"
+    if limit is None:
+        yield from _get_conn().execute(query)
+    else:
+        yield from _get_conn().execute(query + " LIMIT ?", (limit,))
 
 def get_all_feedback():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT * FROM feedback ORDER BY timestamp DESC")
-    rows = c.fetchall()
-    conn.close()
-    return rows
+    return list(iter_feedback())
 
 # Initialize on import
 init_feedback_db()
@@ -5,12 +5,62 @@ AutoKubeX Quick Start Script
 This script helps you get started with AutoKubeX quickly and cleanly.
 """
 
+import argparse
 import subprocess
 import sys
 import os
 from pathlib import Path
 
+def _start_ui():
+    print("\n🎯 Starting Web UI...")
+    print("✨ Features: Auto-persistent sessions, bulk operations, AI diagnosis")
+    print("📍 Opening at: http://localhost:8501")
+    print()
+    # Run the launcher in this interpreter rather than starting a second one
+    import launch_ui
+    sys.argv = ["launch_ui.py"]
+    launch_ui.main()
+
+def _print_cli_help():
+    print("\n💻 CLI Mode Selected")
+    print()
+    print("Available commands:")
+    print("  python main.py --kubeconfig /path/to/kubeconfig diagnose")
+    print("  python main.py --kubeconfig /path/to/kubeconfig list-pods")
+    print("  python main.py --kubeconfig /path/to/kubeconfig bulk-restart-pods-cmd --namespace default --pods 'pod1,pod2'")
+    print()
+    print("📖 See ACTIONS_GUIDE.md for complete CLI documentation")
+
+def _clear_sessions(ask_to_start: bool = True):
+    print("\n🧹 Clearing all sessions...")
+    try:
+        subprocess.run([sys.executable, "clear_sessions.py"])
+        print("\n✅ Sessions cleared! You can now start fresh.")
+    except Exception as e:
+        print(f"\n❌ Error clearing sessions: {e}")
+    
+    if not ask_to_start:
+        return
+    
+    # Ask if they want to start UI after clearing
+    print("\nStart UI after clearing?")
+    start_ui = input("Start Web UI? (y/n): ").strip().lower()
+    if start_ui in ['y', 'yes']:
+        _start_ui()
+
+# Menu choices and --mode values share the same handlers
+ACTIONS = {"1": _start_ui, "2": _print_cli_help, "3": _clear_sessions}
+MODES = {"ui": _start_ui, "cli": _print_cli_help, "clear": lambda: _clear_sessions(ask_to_start=False)}
+
 def main():
+    parser = argparse.ArgumentParser(description="AutoKubeX Quick Start")
+    parser.add_argument("--mode", choices=sorted(MODES), help="Run one option directly instead of showing the menu")
+    args = parser.parse_args()
+    
+    if args.mode:
+        MODES[args.mode]()
+        return
+    
     print("🚀 AutoKubeX Quick Start")
     print("=" * 50)
     print()
@@ -21,45 +71,12 @@ def main():
     print()
     
     while True:
-        choice = input("Enter your choice (1-3): ").strip()
-        
-        if choice == "1":
-            print("\n🎯 Starting Web UI...")
-            print("✨ Features: Auto-persistent sessions, bulk operations, AI diagnosis")
-            print("📍 Opening at: http://localhost:8501")
-            print()
-            subprocess.run([sys.executable, "launch_ui.py"])
-            break
-            
-        elif choice == "2":
-            print("\n💻 CLI Mode Selected")
-            print()
-            print("Available commands:")
-            print("  python main.py diagnose --kubeconfig /path/to/kubeconfig")
-            print("  python main.py list-pods --kubeconfig /path/to/kubeconfig")
-            print("  python main.py bulk-restart-pods-cmd --kubeconfig /path/to/kubeconfig --namespace default --pods 'pod1,pod2'")
-            print()
-            print("📖 See ACTIONS_GUIDE.md for complete CLI documentation")
-            break
-            
-        elif choice == "3":
-            print("\n🧹 Clearing all sessions...")
-            try:
-                subprocess.run([sys.executable, "clear_sessions.py"])
-                print("\n✅ Sessions cleared! You can now start fresh.")
-            except Exception as e:
-                print(f"\n❌ Error clearing sessions: {e}")
-            
-            # Ask if they want to start UI after clearing
-            print("\nStart UI after clearing?")
-            start_ui = input("Start Web UI? (y/n): ").strip().lower()
-            if start_ui in ['y', 'yes']:
-                print("\n🎯 Starting Web UI...")
-                subprocess.run([sys.executable, "launch_ui.py"])
-            break
-            
-        else:
+        action = ACTIONS.get(input("Enter your choice (1-3): ").strip())
+        if action is None:
             print("❌ Invalid choice. Please enter 1, 2, or 3.")
+            continue
+        action()
+        break
 
 if __name__ == "__main__":
     # Check if we're in the right directory
@@ -0,0 +1,111 @@
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+
+from models import feedback_db
+
+
+LEGACY_ROWS = [
+    (1, "why is web crashing", "{}", "OOMKilled", 1, "2025-05-07T10:00:00"),
+    (2, "scale api", "{}", "scaled to 3", 0, "2025-05-08T09:30:00.250000"),
+    (3, "broken row", None, None, None, "not a timestamp"),
+    (4, "null timestamp", None, None, None, None),
+]
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    """A feedback table in the pre-migration layout, with ISO TEXT timestamps"""
+    path = tmp_path / "feedback.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+      CREATE TABLE feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        prompt TEXT,
+        cluster_snapshot TEXT,
+        ai_response TEXT,
+        rating INTEGER,
+        timestamp TEXT
+      )
+    """)
+    conn.executemany("INSERT INTO feedback VALUES (?, ?, ?, ?, ?, ?)", LEGACY_ROWS)
+    conn.commit()
+    conn.close()
+
+    # Point the module at the temporary database with a fresh per-thread connection
+    monkeypatch.setattr(feedback_db, "DB_PATH", str(path))
+    monkeypatch.setattr(feedback_db._local, "conn", None, raising=False)
+    yield path
+    conn = feedback_db._local.conn
+    if conn is not None:
+        conn.close()
+        feedback_db._connections.remove(conn)
+
+
+def test_text_timestamps_are_migrated(legacy_db):
+    feedback_db.init_feedback_db()
+
+    conn = sqlite3.connect(legacy_db)
+    columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(feedback)")}
+    assert columns['timestamp'] == 'INTEGER'
+    assert {row[1] for row in conn.execute("PRAGMA index_list(feedback)")} >= {'idx_feedback_ts'}
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'feedback_legacy'").fetchone() is None
+
+    rows = conn.execute("SELECT * FROM feedback ORDER BY id").fetchall()
+    conn.close()
+    assert [row[:5] for row in rows] == [row[:5] for row in LEGACY_ROWS]
+    assert feedback_db.feedback_datetime(rows[0][5]) == datetime(2025, 5, 7, 10, 0)
+    assert feedback_db.feedback_datetime(rows[1][5]) == datetime(2025, 5, 8, 9, 30, 0, 250000)
+    assert rows[2][5] == 0 and rows[3][5] == 0
+
+
+def test_migrated_rows_read_newest_first(legacy_db):
+    feedback_db.init_feedback_db()
+    feedback_db.store_feedback("new prompt", "{}", "answer", 1)
+
+    assert [row[0] for row in feedback_db.iter_feedback()] == [5, 2, 1, 3, 4]
+    assert [row[0] for row in feedback_db.iter_feedback(limit=2)] == [5, 2]
+
+    # New rows continue the old id sequence
+    assert feedback_db.get_all_feedback()[0][1] == "new prompt"
+
+
+def test_migration_runs_once(legacy_db):
+    feedback_db.init_feedback_db()
+    feedback_db.init_feedback_db()
+
+    conn = sqlite3.connect(legacy_db)
+    assert conn.execute("SELECT COUNT(*) FROM feedback").fetchone()[0] == len(LEGACY_ROWS)
+    conn.close()
+
+
+def test_store_feedback_many(legacy_db):
+    feedback_db.init_feedback_db()
+    base = time.time_ns()
+    feedback_db.store_feedback_many([
+        ("batch 1", "{}", "a", 1, base + 1),
+        ("batch 2", "{}", "b", 0, base + 2),
+        ("batch 3", "{}", "c", 1, base + 3),
+    ])
+
+    rows = list(feedback_db.iter_feedback(limit=3))
+    assert [row[1] for row in rows] == ["batch 3", "batch 2", "batch 1"]
+    assert [row[5] for row in rows] == [base + 3, base + 2, base + 1]
+
+
+def test_store_feedback_many_rolls_back_the_batch(legacy_db):
+    feedback_db.init_feedback_db()
+    before = len(feedback_db.get_all_feedback())
+
+    # The NULL timestamp violates NOT NULL, so the row before it must not be kept either
+    with pytest.raises(sqlite3.IntegrityError):
+        feedback_db.store_feedback_many([
+            ("kept?", "{}", "a", 1, time.time_ns()),
+            ("bad", "{}", "b", 0, None),
+        ])
+
+    assert len(feedback_db.get_all_feedback()) == before
+    feedback_db.store_feedback("after", "{}", "c", 1)
+    assert feedback_db.get_all_feedback()[0][1] == "after"
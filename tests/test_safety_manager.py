@@ -0,0 +1,80 @@
+import io
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from ai_engine import safety_manager
+from ai_engine.safety_manager import SafetyManager, _iter_lines_reversed
+
+
+@pytest.fixture
+def log_paths(tmp_path, monkeypatch):
+    log_path = tmp_path / "safety_log.jsonl"
+    legacy_path = tmp_path / "safety_log.json"
+    monkeypatch.setattr(safety_manager, "SAFETY_LOG_PATH", str(log_path))
+    monkeypatch.setattr(safety_manager, "LEGACY_SAFETY_LOG_PATH", str(legacy_path))
+    return log_path, legacy_path
+
+
+def _read_log(path):
+    return [json.loads(line) for line in path.read_bytes().splitlines() if line.strip()]
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 7, 65536])
+def test_iter_lines_reversed(block_size):
+    data = b"first\nsecond\n\nfourth line\nlast"
+    lines = list(_iter_lines_reversed(io.BytesIO(data), block_size=block_size))
+    assert lines == list(reversed(data.split(b"\n")))
+
+
+@pytest.mark.parametrize("data", [b"", b"\n", b"only"])
+def test_iter_lines_reversed_edge_cases(data):
+    assert list(_iter_lines_reversed(io.BytesIO(data), block_size=2)) == list(reversed(data.split(b"\n")))
+
+
+def test_history_loads_newest_within_a_day(log_paths):
+    log_path, _ = log_paths
+    now = time.time()
+    records = [{'ts': now - 2 * 24 * 3600, 'action': 'old'}]
+    records += [{'ts': now - 150 + i, 'action': f"a{i}"} for i in range(120)]
+    log_path.write_bytes(b"".join(json.dumps(r).encode() + b"\n" for r in records) + b'{"ts": 1')
+
+    manager = SafetyManager()
+    assert [a['action'] for a in manager.action_history] == [f"a{i}" for i in range(20, 120)]
+
+
+def test_log_is_compacted_after_100_appends(log_paths):
+    log_path, _ = log_paths
+    manager = SafetyManager()
+    for i in range(150):
+        manager.log_action({'action': f"restart_pod_{i}", 'parameters': {}}, {'status': 'success'})
+
+    # Compacted to the 100 retained entries at the 100th append, then appended to again
+    logged = [r['action'] for r in _read_log(log_path)]
+    assert logged == [f"restart_pod_{i}" for i in range(100)] + [f"restart_pod_{i}" for i in range(100, 150)]
+
+    reloaded = SafetyManager()
+    assert [a['action'] for a in reloaded.action_history] == [f"restart_pod_{i}" for i in range(50, 150)]
+
+
+def test_legacy_json_log_is_imported_once(log_paths):
+    log_path, legacy_path = log_paths
+    recent = datetime.now() - timedelta(minutes=10)
+    legacy = [
+        {'timestamp': (recent - timedelta(days=3)).isoformat(), 'action': 'stale'},
+        {'timestamp': recent.isoformat(), 'action': 'delete_pod', 'status': 'success'},
+    ]
+    legacy_path.write_text(json.dumps(legacy, indent=2))
+    log_path.write_bytes(json.dumps({'ts': time.time(), 'action': 'scale_deployment'}).encode() + b"\n")
+
+    manager = SafetyManager()
+    assert [a['action'] for a in manager.action_history] == ['delete_pod', 'scale_deployment']
+    assert manager.get_safety_status()['deletions_last_hour'] == 1
+    assert not legacy_path.exists()
+    assert (legacy_path.parent / "safety_log.json.imported").exists()
+
+    # A second start reads only the JSON Lines log
+    assert [r['action'] for r in _read_log(log_path)] == ['stale', 'delete_pod', 'scale_deployment']
+    assert [a['action'] for a in SafetyManager().action_history] == ['delete_pod', 'scale_deployment']